@@ -210,6 +210,7 @@ class SimpleAgent:
         # Frontier-based exploration state
         self.unreachable_frontiers = set()  # Track frontiers that cannot be reached
         self.last_detected_frontiers = []  # Cache last detected frontiers for frontier navigation
+        self.frontier_detector = None  # Created on first overworld step, then reused
         self.consecutive_collisions = 0  # Track collisions for frontier abandonment
         self.consecutive_movements = 0  # Track successful movements
 
@@ -1572,15 +1573,17 @@ class SimpleAgent:
             frontier_suggestions = ""
             if context == "overworld" and coords:
                 try:
-                    from utils.frontier_detection import FrontierDetector
-
-                    # Initialize detector
-                    frontier_detector = FrontierDetector(
-                        max_search_depth=50,
-                        max_frontiers_returned=20,
-                        distance_penalty_factor=0.5,
-                        enable_randomization=True
-                    )
+                    # Initialize detector once; it reuses its grid/BFS buffers across steps
+                    if self.frontier_detector is None:
+                        from utils.frontier_detection import FrontierDetector
+
+                        self.frontier_detector = FrontierDetector(
+                            max_search_depth=50,
+                            max_frontiers_returned=20,
+                            distance_penalty_factor=0.5,
+                            enable_randomization=True
+                        )
+                    frontier_detector = self.frontier_detector
 
                     # Get current objective coords for bonus scoring
                     current_objective_coords = None
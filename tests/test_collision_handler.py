@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests for the collision handler's persistent unreachable-position cache.
+"""
+
+import gc
+import json
+import logging
+import weakref
+
+import numpy as np
+import pytest
+
+from utils import collision_handler
+from utils.collision_handler import (
+    COORD_MAX,
+    COORD_MIN,
+    DIRECTION_INDEX,
+    DIRECTIONS,
+    CollisionHandler,
+    _pack_position,
+    _unpack_position,
+    get_collision_handler,
+)
+
+
+def _abandon(handler, position, action="UP"):
+    """Collide at position until the handler marks it unreachable."""
+    for _ in range(handler.consecutive_collision_limit):
+        result = handler.record_movement(position, action, moved=False)
+    assert result["should_abandon"]
+
+
+def test_handler_is_freed_after_del(tmp_path):
+    """The exit-flush hook must not keep handlers alive."""
+    handler = CollisionHandler(cache_dir=str(tmp_path))
+    ref = weakref.ref(handler)
+    del handler
+    gc.collect()
+    assert ref() is None
+
+
+def test_buffered_positions_written_when_handler_is_collected(tmp_path):
+    """Positions still buffered when a handler goes away reach the log."""
+    handler = CollisionHandler(cache_dir=str(tmp_path))
+    _abandon(handler, (3, 4))
+    _abandon(handler, (5, 6), "LEFT")
+    del handler
+    gc.collect()
+
+    reloaded = CollisionHandler(cache_dir=str(tmp_path))
+    assert reloaded.is_position_unreachable((3, 4), "UP")
+    assert reloaded.is_position_unreachable((5, 6), "LEFT")
+
+
+def test_reset_does_not_resurrect_cleared_positions(tmp_path, monkeypatch):
+    """Replacing the singleton flushes the old handler before the new one loads."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(collision_handler, "_collision_handler_instance", None)
+
+    old = get_collision_handler()
+    _abandon(old, (1, 1))
+    _abandon(old, (2, 2), "RIGHT")  # Still buffered: within the flush interval
+
+    new = get_collision_handler(reset=True)
+    assert new is not old
+    assert new.is_position_unreachable((2, 2), "RIGHT")
+
+    new.clear_unreachable_positions()
+    # Simulate interpreter exit for the old handler
+    old._finalizer()
+    new.close()
+
+    assert not CollisionHandler().unreachable_positions
+
+
+def test_pack_unpack_round_trip():
+    """Packed keys decode to the same position, including negative coordinates."""
+    coords = [0, 1, -1, 7, -7, 255, -256, COORD_MIN, COORD_MAX]
+    keys = set()
+    for x in coords:
+        for y in coords:
+            for dir_idx, direction in enumerate(DIRECTIONS):
+                key = _pack_position(x, y, dir_idx)
+                assert _unpack_position(key) == (x, y, direction)
+                keys.add(key)
+    # Distinct positions never share a key
+    assert len(keys) == len(coords) ** 2 * len(DIRECTIONS)
+
+
+def test_pack_rejects_out_of_range_coordinates():
+    """Coordinates that would wrap in 16 bits are rejected instead of aliasing."""
+    for x, y in [(70000, 0), (0, COORD_MAX + 1), (COORD_MIN - 1, 5)]:
+        with pytest.raises(ValueError):
+            _pack_position(x, y, 0)
+
+
+def test_out_of_range_position_is_not_marked(tmp_path):
+    """An out-of-range position can't be persisted, so it is never marked."""
+    handler = CollisionHandler(cache_dir=str(tmp_path))
+    _abandon(handler, (70000, 3))
+    assert not handler.is_position_unreachable((70000, 3))
+    # 70000 wraps to 4464 in 16 bits; that position must stay reachable too
+    assert not handler.is_position_unreachable((4464, 3))
+    assert handler.filter_reachable(np.array([70000, 4464]), np.array([3, 3]), np.array([0, 0])).all()
+
+
+def test_json_cache_migrates_to_binary_log(tmp_path, caplog):
+    """A legacy JSON cache is loaded, rewritten as the binary log and skips bad entries."""
+    legacy = {
+        "unreachable_positions": [
+            [3, 4, "UP"],
+            [-2, 9, "LEFT"],
+            [5, 5, "A"],          # Not a direction
+            [70000, 1, "DOWN"],   # Doesn't fit the packed format
+        ]
+    }
+    (tmp_path / "unreachable_positions.json").write_text(json.dumps(legacy))
+
+    with caplog.at_level(logging.WARNING, logger="utils.collision_handler"):
+        handler = CollisionHandler(cache_dir=str(tmp_path))
+    assert "Dropped 2" in caplog.text
+
+    expected = {
+        _pack_position(3, 4, DIRECTION_INDEX["UP"]),
+        _pack_position(-2, 9, DIRECTION_INDEX["LEFT"]),
+    }
+    assert handler.unreachable_positions == expected
+    assert handler.is_position_unreachable((-2, 9), "LEFT")
+
+    log_file = tmp_path / "unreachable_positions.bin"
+    assert log_file.exists()
+    assert set(np.fromfile(log_file, dtype="<u8").tolist()) == expected
+
+    # The binary log takes precedence from now on
+    assert CollisionHandler(cache_dir=str(tmp_path)).unreachable_positions == expected
+
+
+def test_append_then_reload(tmp_path):
+    """Marked positions are appended to the log and come back on reload."""
+    handler = CollisionHandler(cache_dir=str(tmp_path))
+    _abandon(handler, (10, -3), "DOWN")
+    handler.close()
+
+    handler = CollisionHandler(cache_dir=str(tmp_path))
+    _abandon(handler, (-4, 8), "RIGHT")
+    handler._mark_unreachable((10, -3), "DOWN")  # Already known: not appended again
+    handler.close()
+
+    keys = np.fromfile(tmp_path / "unreachable_positions.bin", dtype="<u8")
+    assert len(keys) == 2
+
+    reloaded = CollisionHandler(cache_dir=str(tmp_path))
+    assert reloaded.is_position_unreachable((10, -3), "DOWN")
+    assert reloaded.is_position_unreachable((-4, 8), "RIGHT")
+    assert not reloaded.is_position_unreachable((-4, 8), "LEFT")
+    assert reloaded.get_safe_directions((-4, 8)) == ["UP", "DOWN", "LEFT"]
+
+
+@pytest.mark.parametrize("kernel", ["default", "loop", "numpy"])
+def test_filter_reachable_matches_is_position_unreachable(tmp_path, monkeypatch, kernel):
+    """Batch queries agree with the per-position check (numba and fallback kernels)."""
+    if kernel == "loop":
+        monkeypatch.setattr(collision_handler, "_reachable_mask", collision_handler._reachable_mask_loop)
+    elif kernel == "numpy":
+        monkeypatch.setattr(collision_handler, "_reachable_mask", collision_handler._reachable_mask_numpy)
+
+    rng = np.random.default_rng(1234)
+    handler = CollisionHandler(cache_dir=str(tmp_path))
+
+    xs = rng.integers(-20, 20, size=500)
+    ys = rng.integers(-20, 20, size=500)
+    dirs = rng.integers(0, len(DIRECTIONS), size=500)
+    # Empty set first, then with marked positions
+    assert handler.filter_reachable(xs, ys, dirs).all()
+
+    for x, y, d in zip(xs[:60], ys[:60], dirs[:60], strict=True):
+        handler._mark_unreachable((int(x), int(y)), DIRECTIONS[d])
+
+    reachable = handler.filter_reachable(xs, ys, dirs)
+    expected = [
+        not handler.is_position_unreachable((int(x), int(y)), DIRECTIONS[d])
+        for x, y, d in zip(xs, ys, dirs, strict=True)
+    ]
+    assert reachable.tolist() == expected
+    assert not reachable[:60].any()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the frontier detector's symbol grid and BFS kernels.
+"""
+
+import random
+from collections import deque
+
+import numpy as np
+import pytest
+
+from pokemon_env.enums import MetatileBehavior
+from utils import frontier_detection
+from utils.frontier_detection import EXPLORABLE_SYMBOLS, FrontierDetector
+from utils.map_formatter import format_tile_to_symbol
+
+PLAYER_X = 40
+PLAYER_Y = 25
+
+# Explicit kernels so both paths run regardless of which one the module picked
+KERNELS = [
+    pytest.param(
+        "numba",
+        marks=pytest.mark.skipif(not frontier_detection.NUMBA_AVAILABLE, reason="numba not installed"),
+    ),
+    pytest.param("fallback"),
+]
+
+_BFS_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _random_window(rng):
+    """15x15 memory window of random tiles with an explored, walkable center."""
+    behaviors = [int(behavior) for behavior in MetatileBehavior]
+    rows = []
+    for _ in range(15):
+        row = []
+        for _ in range(15):
+            roll = rng.random()
+            if roll < 0.25:
+                row.append(())  # Unexplored
+            elif roll < 0.35:
+                row.append((1, MetatileBehavior.NORMAL, 1, 0))  # Wall via collision
+            elif roll < 0.37:
+                row.append((1023, MetatileBehavior.NORMAL, 0, 0))  # Wall via tile id
+            elif roll < 0.5:
+                row.append((1, rng.choice(behaviors), 0, 0))
+            else:
+                row.append((1, MetatileBehavior.NORMAL, 0, 0))
+        rows.append(row)
+    rows[7][7] = (1, MetatileBehavior.NORMAL, 0, 0)
+    return rows
+
+
+def _reference_symbols(raw_tiles):
+    """World (x, y) -> symbol for every explored tile, via the map formatter."""
+    symbols = {}
+    for row_idx, row in enumerate(raw_tiles):
+        for col_idx, tile_data in enumerate(row):
+            if tile_data and len(tile_data) >= 2:
+                symbols[(PLAYER_X - 7 + col_idx, PLAYER_Y - 7 + row_idx)] = format_tile_to_symbol(tile_data)
+    return symbols
+
+
+def _random_masks(rng):
+    """Random explorable/frontier masks, start cell and depth limit honoring the kernel contract."""
+    height = rng.randint(5, 19)
+    width = rng.randint(5, 19)
+    explorable = np.zeros((height, width), dtype=np.bool_)
+    frontier = np.zeros((height, width), dtype=np.bool_)
+    for y in range(height):
+        for x in range(width):
+            # Explorable cells never touch the outer ring, as with the padded symbol grid
+            if 0 < y < height - 1 and 0 < x < width - 1:
+                explorable[y, x] = rng.random() < 0.65
+            frontier[y, x] = rng.random() < 0.3
+    start = (rng.randint(1, width - 2), rng.randint(1, height - 2))
+    max_depth = rng.choice((1, 3, 8, 50))
+    return explorable, frontier, start, max_depth
+
+
+def _candidates(explorable, frontier, start):
+    """Frontiers the BFS can dequeue, counted the way _run_frontier_bfs does."""
+    candidates = int(np.count_nonzero(frontier & explorable))
+    if frontier[start[1], start[0]] and not explorable[start[1], start[0]]:
+        candidates += 1
+    return candidates
+
+
+def _reference_frontiers(explorable, frontier, start, max_depth, candidates):
+    """Plain BFS over (x, y) tuples, reporting frontiers in discovery order."""
+    seen = {start}
+    queue = deque([(start, 0)])
+    found = []
+    depth = 0
+    while queue:
+        (x, y), d = queue.popleft()
+        if d >= max_depth:
+            continue
+        depth = d + 1
+        if frontier[y, x]:
+            found.append((x, y))
+            if len(found) == candidates:
+                break
+        for dx, dy in _BFS_STEPS:
+            nx, ny = x + dx, y + dy
+            if (nx, ny) not in seen and explorable[ny, nx]:
+                seen.add((nx, ny))
+                queue.append(((nx, ny), d + 1))
+    return found, depth
+
+
+def _run_kernel(kernel, explorable, frontier, start, max_depth, candidates):
+    """Call the numba or fallback BFS kernel with fresh caller-owned buffers."""
+    bfs = frontier_detection._bfs_frontiers if kernel == "numba" else frontier_detection._bfs_frontiers_python
+    cells = explorable.size
+    xs, ys, depth = bfs(
+        explorable, frontier, start[0], start[1], max_depth, candidates,
+        np.zeros(explorable.shape, dtype=np.bool_),
+        np.empty((cells, 3), dtype=np.int32),
+        np.empty((cells, 2), dtype=np.int32)
+    )
+    return list(zip(xs.tolist(), ys.tolist(), strict=True)), int(depth)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_symbol_grid_matches_formatter(seed):
+    raw_tiles = _random_window(random.Random(seed))
+    detector = FrontierDetector(enable_randomization=False)
+    id_grid = detector._build_symbol_grid(raw_tiles, PLAYER_X, PLAYER_Y)
+    symbols = _reference_symbols(raw_tiles)
+
+    def symbol_at(x, y):
+        return symbols.get((x, y), '?')
+
+    for row in range(id_grid.shape[0]):
+        for col in range(id_grid.shape[1]):
+            x = detector._grid_origin_x + col
+            y = detector._grid_origin_y + row
+            symbol = symbol_at(x, y)
+            assert id_grid[row, col] == FrontierDetector.SYMBOL_IDS.get(symbol, FrontierDetector.UNKNOWN_SYMBOL_ID)
+            assert detector._explored_mask[row, col] == (symbol != '?')
+            assert detector._explorable_mask[row, col] == (symbol in EXPLORABLE_SYMBOLS)
+            assert detector._frontier_mask[row, col] == (
+                symbol == '?' and any(symbol_at(x + dx, y + dy) != '?' for dx, dy in _BFS_STEPS)
+            )
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("seed", range(50))
+def test_bfs_frontiers_match_reference(kernel, seed):
+    explorable, frontier, start, max_depth = _random_masks(random.Random(seed))
+    # _run_frontier_bfs never calls the kernel without a candidate
+    candidates = max(_candidates(explorable, frontier, start), 1)
+
+    expected = _reference_frontiers(explorable, frontier, start, max_depth, candidates)
+    assert _run_kernel(kernel, explorable, frontier, start, max_depth, candidates) == expected
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_bfs_frontiers_stop_at_candidates(kernel):
+    explorable, frontier, start, _ = _random_masks(random.Random(0))
+    frontier |= explorable
+    explorable[start[1], start[0]] = True
+
+    found, depth = _run_kernel(kernel, explorable, frontier, start, 50, 3)
+    assert (found, depth) == _reference_frontiers(explorable, frontier, start, 50, 3)
+    assert len(found) == 3
+
+
+def test_run_frontier_bfs_reports_unexplored_start():
+    raw_tiles = [[(1, MetatileBehavior.NORMAL, 0, 0)] * 15 for _ in range(15)]
+    raw_tiles[0] = [()] * 15
+    detector = FrontierDetector(enable_randomization=False)
+    detector._build_symbol_grid(raw_tiles, PLAYER_X, PLAYER_Y)
+    start = (PLAYER_X, PLAYER_Y - 7)  # Unexplored top row, above explored tiles
+
+    scores, xs, ys = detector._run_frontier_bfs(
+        start_pos=start,
+        game_state={},
+        player_pos=(PLAYER_X, PLAYER_Y),
+        unreachable=set(),
+        current_objective=None
+    )
+    assert list(zip(xs.tolist(), ys.tolist(), strict=True)) == [start]
+    assert len(scores) == 1
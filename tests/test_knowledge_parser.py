@@ -0,0 +1,52 @@
+"""Tests for the pickled parse cache in utils.knowledge_parser"""
+
+import shutil
+from pathlib import Path
+
+from utils.knowledge_parser import KnowledgeParser
+
+SPEEDRUN_MD = Path(__file__).resolve().parent.parent / "data" / "knowledge" / "speedrun.md"
+
+
+def _copy_guide(tmp_path):
+    knowledge_file = tmp_path / "speedrun.md"
+    shutil.copyfile(SPEEDRUN_MD, knowledge_file)
+    return knowledge_file
+
+
+def test_cache_is_off_by_default(tmp_path):
+    knowledge_file = _copy_guide(tmp_path)
+    parser = KnowledgeParser(str(knowledge_file))
+    assert parser.parse_markdown()
+    assert not parser.cache_file.exists()
+
+
+def test_cache_hit_matches_fresh_parse(tmp_path, monkeypatch):
+    knowledge_file = _copy_guide(tmp_path)
+
+    fresh = KnowledgeParser(str(knowledge_file), use_cache=True)
+    fresh_sections = fresh.parse_markdown()
+    assert fresh.cache_file.exists()
+
+    def _no_reparse(self, content):
+        raise AssertionError("expected a cache hit")
+
+    monkeypatch.setattr(KnowledgeParser, "_split_headers_nested", _no_reparse)
+    cached = KnowledgeParser(str(knowledge_file), use_cache=True)
+    cached_sections = cached.parse_markdown()
+
+    assert list(cached_sections) == list(fresh_sections)
+    assert cached_sections == fresh_sections
+    for section in fresh_sections.values():
+        for milestone_id in section.milestone_ids:
+            assert cached.get_section_by_milestone(milestone_id) == fresh.get_section_by_milestone(milestone_id)
+        assert cached.get_section_by_location(section.location_id) == fresh.get_section_by_location(section.location_id)
+
+
+def test_stale_cache_is_ignored(tmp_path):
+    knowledge_file = _copy_guide(tmp_path)
+    KnowledgeParser(str(knowledge_file), use_cache=True).parse_markdown()
+
+    knowledge_file.write_text("# Only Section\n\n- A tip\n", encoding="utf-8")
+    reparsed = KnowledgeParser(str(knowledge_file), use_cache=True).parse_markdown()
+    assert reparsed == KnowledgeParser(str(knowledge_file)).parse_markdown()
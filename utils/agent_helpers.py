@@ -5,14 +5,34 @@ Shared helper functions for all agents.
 import logging
 import os
 import re
+import sys
 import json
+import time
 import requests
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from utils.llm_logger import get_llm_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Backoff state for update_server_metrics: when the server is unreachable we
+# skip POSTs until _next_metrics_attempt_ts instead of paying a failed connect
+# on every agent step.
+_METRICS_BACKOFF_INITIAL = 0.5
+_METRICS_BACKOFF_MAX = 30.0
+_next_metrics_attempt_ts = 0.0
+_metrics_backoff = _METRICS_BACKOFF_INITIAL
+
+# Interned button tokens so restored recent_actions share one string object per button
+_ACTION_INTERN = {a: sys.intern(a) for a in ("UP", "DOWN", "LEFT", "RIGHT", "A", "B", "START", "SELECT")}
+
 
 def update_server_metrics(server_url: str = "http://localhost:8000") -> None:
     """
@@ -21,27 +41,48 @@ def update_server_metrics(server_url: str = "http://localhost:8000") -> None:
     This is a shared function used by all agents to send metrics to the server
     for display in the web interface.
 
+    If the server is unreachable, further updates are skipped for an
+    exponentially growing backoff window (capped at 30s) so offline runs don't
+    pay a connection attempt on every step.
+
     Args:
         server_url: Base URL of the server (default: http://localhost:8000)
     """
+    global _next_metrics_attempt_ts, _metrics_backoff
+
+    if time.monotonic() < _next_metrics_attempt_ts:
+        return
+
     try:
 
         # Get current LLM metrics
         llm_logger = get_llm_logger()
         metrics = llm_logger.get_cumulative_metrics()
 
+        # Pre-serialize the payload (orjson when available) instead of
+        # letting requests run the stdlib encoder
+        if ORJSON_AVAILABLE:
+            body = orjson.dumps({"metrics": metrics})
+        else:
+            body = json.dumps({"metrics": metrics})
+
         # Send metrics to server
         try:
             response = requests.post(
                 f"{server_url}/agent_step",
-                json={"metrics": metrics},
+                data=body,
+                headers={"Content-Type": "application/json"},
                 timeout=1
             )
             if response.status_code != 200:
                 logger.debug(f"Failed to update server metrics: {response.status_code}")
+            _next_metrics_attempt_ts = 0.0
+            _metrics_backoff = _METRICS_BACKOFF_INITIAL
         except requests.exceptions.RequestException:
-            # Silent fail - server might not be running or in different mode
-            pass
+            # Silent fail - server might not be running or in different mode.
+            # Back off before trying again.
+            _next_metrics_attempt_ts = time.monotonic() + _metrics_backoff
+            _metrics_backoff = min(_metrics_backoff * 2, _METRICS_BACKOFF_MAX)
 
     except Exception as e:
         logger.debug(f"Error updating server metrics: {e}")
@@ -273,6 +314,15 @@ def initialize_storyline_objectives(objectives_list: List[Any]) -> List[Dict[str
     return storyline_objectives
 
 
+@lru_cache(maxsize=4096)
+def _parse_checkpoint_timestamp(timestamp_str: str) -> Optional[datetime]:
+    """Parse an ISO timestamp from a checkpoint entry, or None if malformed."""
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+
+
 def load_history_from_llm_checkpoint(
     checkpoint_file: str, agent_state: Any, history_entry_class: Any, step_counter_attr: str = "step_counter"
 ) -> bool:
@@ -339,12 +389,11 @@ def load_history_from_llm_checkpoint(
                         action_taken = action_line
 
                     # Parse timestamp
-                    timestamp = datetime.now()
+                    timestamp = None
                     if timestamp_str:
-                        try:
-                            timestamp = datetime.fromisoformat(timestamp_str)
-                        except:
-                            pass
+                        timestamp = _parse_checkpoint_timestamp(timestamp_str)
+                    if timestamp is None:
+                        timestamp = datetime.now()
 
                     # Create simplified game state summary
                     game_state_summary = f"Position: {coords}" if coords else "Position unknown"
@@ -378,8 +427,9 @@ def load_history_from_llm_checkpoint(
                         # Parse multiple actions if comma-separated
                         actions = [a.strip() for a in action_taken.replace(",", " ").split()]
                         for action in actions:
-                            if action in ["UP", "DOWN", "LEFT", "RIGHT", "A", "B", "START", "SELECT"]:
-                                agent_state.recent_actions.append(action)
+                            tok = _ACTION_INTERN.get(action)
+                            if tok is not None:
+                                agent_state.recent_actions.append(tok)
 
                     restored_count += 1
 
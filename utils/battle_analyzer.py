@@ -6,8 +6,18 @@ Phase 1.3 implementation from TRACK2_SIMPLE_AGENT_OPTIMIZATION_PLAN.md
 """
 
 import logging
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Any
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Type effectiveness chart for Pokemon Gen 3 (Emerald)
@@ -84,12 +94,233 @@ TYPE_CHART = {
     }
 }
 
+# Flat type chart: TYPE_CHART_LOG2[atk_idx, def_idx] holds log2 of the multiplier
+# (-1 for 0.5x, 0 for 1x, 1 for 2x) and IMMUNE for 0x, so a matchup against a
+# dual-type defender is a sum of two entries instead of nested dict lookups.
+TYPE_NAMES = tuple(TYPE_CHART.keys())
+TYPE_INDEX = {name: i for i, name in enumerate(TYPE_NAMES)}
+IMMUNE = -128
+
+TYPE_CHART_LOG2 = np.zeros((len(TYPE_NAMES), len(TYPE_NAMES)), dtype=np.int8)
+for _atk, _row in TYPE_CHART.items():
+    for _def, _mult in _row.items():
+        TYPE_CHART_LOG2[TYPE_INDEX[_atk], TYPE_INDEX[_def]] = IMMUNE if _mult == 0 else int(np.log2(_mult))
+
+# Defending types each attacking type cannot affect at all (0x)
+IMMUNITIES = {
+    atk: frozenset(d for d, mult in row.items() if mult == 0)
+    for atk, row in TYPE_CHART.items()
+}
+
+# The chart is fixed, so every (attacking type, defender type 1, defender type 2)
+# multiplier is precomputed. NO_TYPE stands in for a missing second type.
+NO_TYPE = len(TYPE_NAMES)
+_padded_log2 = np.zeros((len(TYPE_NAMES), len(TYPE_NAMES) + 1), dtype=np.int16)
+_padded_log2[:, :NO_TYPE] = TYPE_CHART_LOG2
+_padded_immune = _padded_log2 == IMMUNE
+_padded_log2[_padded_immune] = 0
+EFFECTIVENESS_TABLE = np.where(
+    _padded_immune[:, :, None] | _padded_immune[:, None, :],
+    0.0,
+    np.exp2(_padded_log2[:, :, None] + _padded_log2[:, None, :])
+)
+
+
+def _defender_indices(defend_types) -> Tuple[int, ...]:
+    """Map defending type names to chart indices, dropping unknown/missing types."""
+    return tuple(TYPE_INDEX[t] for t in defend_types if t in TYPE_INDEX)
+
+
+def _effectiveness_row(def_indices: Tuple[int, ...]) -> np.ndarray:
+    """Multiplier of every attacking type (by index) against the given defender."""
+    if len(def_indices) <= 2:
+        padded = def_indices + (NO_TYPE,) * (2 - len(def_indices))
+        return EFFECTIVENESS_TABLE[:, padded[0], padded[1]]
+    return np.array([_effectiveness_by_index(i, def_indices) for i in range(len(TYPE_NAMES))])
+
+
+def _effectiveness_by_index(atk_idx: int, def_indices: Tuple[int, ...]) -> float:
+    """Effectiveness multiplier of attack type atk_idx against pre-resolved defender indices."""
+    if len(def_indices) == 1:
+        return float(EFFECTIVENESS_TABLE[atk_idx, def_indices[0], NO_TYPE])
+    if len(def_indices) == 2:
+        return float(EFFECTIVENESS_TABLE[atk_idx, def_indices[0], def_indices[1]])
+
+    row = TYPE_CHART_LOG2[atk_idx]
+    total = 0
+
+    for def_idx in def_indices:
+        entry = int(row[def_idx])
+        if entry == IMMUNE:
+            return 0.0
+        total += entry
+
+    return 2.0 ** total
+
+
+def _max_threat_loop(atk_indices: np.ndarray, member_defs: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """
+    Worst-case multiplier of any attacking type against each party member.
+
+    member_defs is (members, 2) defender indices padded with NO_TYPE; the result
+    never drops below 1.0, matching should_switch's neutral starting point.
+    """
+    out = np.ones(member_defs.shape[0])
+    for m in range(member_defs.shape[0]):
+        d1 = member_defs[m, 0]
+        d2 = member_defs[m, 1]
+        for a in atk_indices:
+            eff = table[a, d1, d2]
+            if eff > out[m]:
+                out[m] = eff
+    return out
+
+
+def _max_threat_numpy(atk_indices: np.ndarray, member_defs: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """Vectorized fallback for _max_threat_loop when numba is unavailable"""
+    if atk_indices.shape[0] == 0:
+        return np.ones(member_defs.shape[0])
+    threats = table[atk_indices[:, None], member_defs[None, :, 0], member_defs[None, :, 1]]
+    return np.maximum(threats.max(axis=0), 1.0)
+
+
+if NUMBA_AVAILABLE:
+    _max_threat = njit(cache=True)(_max_threat_loop)
+else:
+    _max_threat = _max_threat_numpy
+
+
+def _party_threats(attack_types: List[str], members_types: List[List[str]]) -> List[float]:
+    """
+    Strongest multiplier any of attack_types has against each member, in one batch.
+
+    Unknown attacking types are neutral, so they can't raise the result above 1.0
+    and are dropped up front.
+    """
+    atk_indices = np.array([TYPE_INDEX[t] for t in attack_types if t in TYPE_INDEX], dtype=np.int64)
+    member_indices = [_defender_indices(types) for types in members_types]
+
+    if any(len(defs) > 2 for defs in member_indices):
+        # Not representable in EFFECTIVENESS_TABLE; score one at a time
+        return [
+            max([1.0] + [_effectiveness_by_index(int(a), defs) for a in atk_indices])
+            for defs in member_indices
+        ]
+
+    member_defs = np.array(
+        [defs + (NO_TYPE,) * (2 - len(defs)) for defs in member_indices], dtype=np.int64
+    ).reshape(-1, 2)
+    return [float(threat) for threat in _max_threat(atk_indices, member_defs, EFFECTIVENESS_TABLE)]
+
+
+@lru_cache(maxsize=4096)
+def _type_effectiveness(attack_type: str, defend_types: Tuple[str, ...]) -> float:
+    """Cached type effectiveness lookup; see BattleAnalyzer.get_type_effectiveness."""
+    atk_idx = TYPE_INDEX.get(attack_type)
+    if atk_idx is None:
+        return 1.0  # Unknown type
+
+    # Any immune defending type zeroes the attack regardless of the rest
+    if not IMMUNITIES[attack_type].isdisjoint(defend_types):
+        return 0.0
+
+    return _effectiveness_by_index(atk_idx, _defender_indices(defend_types))
+
+
+@lru_cache(maxsize=4096)
+def _move_score(
+    move_power: int,
+    has_stab: bool,
+    effectiveness: float,
+    move_pp: int
+) -> Tuple[float, str]:
+    """Cached move scoring from resolved STAB/effectiveness; see BattleAnalyzer.calculate_move_score."""
+    if move_power == 0 or move_power is None:
+        # Status move or unknown power
+        return (10.0, "Status move - situational")
+
+    # Base score from power
+    score = float(move_power)
+    explanation_parts = [f"Base power: {move_power}"]
+
+    # STAB bonus (Same Type Attack Bonus = 1.5x)
+    if has_stab:
+        score *= 1.5
+        explanation_parts.append("STAB bonus (1.5x)")
+
+    # Type effectiveness
+    score *= effectiveness
+
+    if effectiveness == 0:
+        explanation_parts.append("NO EFFECT (0x)")
+    elif effectiveness == 0.25:
+        explanation_parts.append("Not very effective (0.25x)")
+    elif effectiveness == 0.5:
+        explanation_parts.append("Not very effective (0.5x)")
+    elif effectiveness == 2.0:
+        explanation_parts.append("Super effective (2x)")
+    elif effectiveness == 4.0:
+        explanation_parts.append("Super effective (4x)")
+    else:
+        explanation_parts.append("Neutral effectiveness (1x)")
+
+    # PP consideration - penalize moves with low PP
+    if move_pp == 0:
+        score = 0
+        explanation_parts.append("NO PP REMAINING")
+    elif move_pp <= 2:
+        score *= 0.8
+        explanation_parts.append(f"Low PP ({move_pp} remaining)")
+
+    explanation = " | ".join(explanation_parts)
+    return (score, explanation)
+
+
+def _score_moves(
+    powers: np.ndarray,
+    stab: np.ndarray,
+    effectiveness: np.ndarray,
+    pps: np.ndarray
+) -> np.ndarray:
+    """
+    Score a whole moveset at once; matches _move_score element-wise.
+
+    Status moves (power 0) score a flat 10, damaging moves with no PP score 0.
+    """
+    scores = powers * np.where(stab, 1.5, 1.0) * effectiveness * np.where(pps <= 2, 0.8, 1.0)
+    scores[pps == 0] = 0.0
+    scores[powers == 0] = 10.0
+    return scores
+
+
+_MISSING = object()
+
+
+def _freeze_fields(data: Optional[Dict[str, Any]], fields: Tuple[str, ...]) -> Optional[tuple]:
+    """Hashable snapshot of the given fields (lists become tuples, absent keys stay distinct)"""
+    if data is None:
+        return None
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (data.get(f, _MISSING) for f in fields)
+    )
+
 
 class BattleAnalyzer:
     """Analyzes battle situations and recommends optimal moves"""
 
+    # Number of recent battle states whose formatted analysis is kept
+    ANALYSIS_CACHE_SIZE = 16
+
     def __init__(self):
         self.type_chart = TYPE_CHART
+        self._analysis_cache: OrderedDict[tuple, str] = OrderedDict()
+
+        # Compile the party scoring kernel now so the first battle turn isn't slowed by JIT
+        if NUMBA_AVAILABLE:
+            _max_threat(
+                np.zeros(1, dtype=np.int64), np.zeros((1, 2), dtype=np.int64), EFFECTIVENESS_TABLE
+            )
         logger.info("Battle Analyzer initialized with type effectiveness data")
 
     def get_type_effectiveness(self, attack_type: str, defend_types: List[str]) -> float:
@@ -103,19 +334,7 @@ class BattleAnalyzer:
         Returns:
             float: Damage multiplier (0, 0.25, 0.5, 1.0, 2.0, or 4.0)
         """
-        if not attack_type or attack_type == "???":
-            return 1.0  # Unknown type
-
-        multiplier = 1.0
-
-        for defend_type in defend_types:
-            if defend_type and defend_type != "???":
-                # Get effectiveness from chart
-                type_matchup = self.type_chart.get(attack_type, {})
-                effectiveness = type_matchup.get(defend_type, 1.0)
-                multiplier *= effectiveness
-
-        return multiplier
+        return _type_effectiveness(attack_type, tuple(defend_types))
 
     def calculate_move_score(
         self,
@@ -141,46 +360,11 @@ class BattleAnalyzer:
             Tuple of (score, explanation)
         """
         if move_power == 0 or move_power is None:
-            # Status move or unknown power
-            return (10.0, "Status move - situational")
+            return _move_score(move_power, False, 1.0, move_pp)
 
-        # Base score from power
-        score = float(move_power)
-        explanation_parts = [f"Base power: {move_power}"]
-
-        # STAB bonus (Same Type Attack Bonus = 1.5x)
         has_stab = move_type in attacker_types
-        if has_stab:
-            score *= 1.5
-            explanation_parts.append("STAB bonus (1.5x)")
-
-        # Type effectiveness
-        effectiveness = self.get_type_effectiveness(move_type, defender_types)
-        score *= effectiveness
-
-        if effectiveness == 0:
-            explanation_parts.append("NO EFFECT (0x)")
-        elif effectiveness == 0.25:
-            explanation_parts.append("Not very effective (0.25x)")
-        elif effectiveness == 0.5:
-            explanation_parts.append("Not very effective (0.5x)")
-        elif effectiveness == 2.0:
-            explanation_parts.append("Super effective (2x)")
-        elif effectiveness == 4.0:
-            explanation_parts.append("Super effective (4x)")
-        else:
-            explanation_parts.append("Neutral effectiveness (1x)")
-
-        # PP consideration - penalize moves with low PP
-        if move_pp == 0:
-            score = 0
-            explanation_parts.append("NO PP REMAINING")
-        elif move_pp <= 2:
-            score *= 0.8
-            explanation_parts.append(f"Low PP ({move_pp} remaining)")
-
-        explanation = " | ".join(explanation_parts)
-        return (score, explanation)
+        effectiveness = _type_effectiveness(move_type, tuple(defender_types))
+        return _move_score(move_power, has_stab, effectiveness, move_pp)
 
     def get_best_move(
         self,
@@ -213,56 +397,72 @@ class BattleAnalyzer:
             if not defender_types:
                 defender_types = ['Normal']  # Default
 
-            # Score each move
-            move_scores = []
+            # Resolve types once per turn rather than once per move
+            stab_types = frozenset(attacker_types)
+            effectiveness_row = _effectiveness_row(_defender_indices(defender_types))
+
+            # Fill preallocated per-slot arrays and score the moveset in one pass
+            n_slots = len(available_moves)
+            powers = np.zeros(n_slots)
+            stab = np.zeros(n_slots, dtype=bool)
+            effectiveness = np.ones(n_slots)
+            pps = np.zeros(n_slots, dtype=np.int64)
+            indices, names = [], []
+            n = 0
             for i, move_data in enumerate(available_moves):
                 if not move_data:
                     continue
 
-                move_name = move_data.get('name', f'Move {i+1}')
                 move_type = move_data.get('type', 'Normal')
-                move_power = move_data.get('power', 0)
-                move_pp = move_data.get('pp', 0)
-
-                score, explanation = self.calculate_move_score(
-                    move_name, move_type, move_power,
-                    attacker_types, defender_types, move_pp
-                )
-
-                move_scores.append({
-                    'index': i,
-                    'name': move_name,
-                    'score': score,
-                    'explanation': explanation
-                })
-
-            if not move_scores:
+                atk_idx = TYPE_INDEX.get(move_type)
+
+                indices.append(i)
+                names.append(move_data.get('name', f'Move {i+1}'))
+                powers[n] = move_data.get('power', 0) or 0
+                pps[n] = move_data.get('pp', 0)
+                stab[n] = move_type in stab_types
+                if atk_idx is not None:
+                    effectiveness[n] = effectiveness_row[atk_idx]
+                n += 1
+
+            if not n:
                 return (None, "No valid moves available")
 
-            # Sort by score (highest first)
-            move_scores.sort(key=lambda x: x['score'], reverse=True)
+            scores = _score_moves(powers[:n], stab[:n], effectiveness[:n], pps[:n])
 
-            # Get best move
-            best_move = move_scores[0]
+            # Single pass for best and runner-up; ties go to the earlier move
+            best = second = None
+            score_list = scores.tolist()
+            for k, score in enumerate(score_list):
+                if best is None or score > score_list[best]:
+                    second, best = best, k
+                elif second is None or score > score_list[second]:
+                    second = k
+
+            # Only the best move's explanation is shown, so build just that one
+            _, explanation = _move_score(
+                int(powers[best]), bool(stab[best]), float(effectiveness[best]), int(pps[best])
+            )
+            best_score = score_list[best]
 
             # Build reasoning
             reasoning_parts = [
-                f"Best move: {best_move['name']} (Move {best_move['index'] + 1})",
-                f"Score: {best_move['score']:.1f}",
-                best_move['explanation']
+                f"Best move: {names[best]} (Move {indices[best] + 1})",
+                f"Score: {best_score:.1f}",
+                explanation
             ]
 
             # Show alternative if close
-            if len(move_scores) > 1:
-                second_best = move_scores[1]
-                if second_best['score'] > 0 and second_best['score'] >= best_move['score'] * 0.8:
+            if second is not None:
+                second_score = score_list[second]
+                if second_score > 0 and second_score >= best_score * 0.8:
                     reasoning_parts.append(
-                        f"Alternative: {second_best['name']} (score: {second_best['score']:.1f})"
+                        f"Alternative: {names[second]} (score: {second_score:.1f})"
                     )
 
             reasoning = " | ".join(reasoning_parts)
 
-            return (best_move['index'], reasoning)
+            return (indices[best], reasoning)
 
         except Exception as e:
             logger.error(f"Error analyzing best move: {e}", exc_info=True)
@@ -297,32 +497,25 @@ class BattleAnalyzer:
 
             # Calculate how effective opponent's likely moves are against us
             # (Simplified: assume opponent has a move of their own type)
-            worst_effectiveness = 1.0
-            for opp_type in opponent_types:
-                effectiveness = self.get_type_effectiveness(opp_type, your_types)
-                if effectiveness > worst_effectiveness:
-                    worst_effectiveness = effectiveness
+            worst_effectiveness = _party_threats(opponent_types, [your_types])[0]
 
             # If we're weak to opponent AND low HP, consider switching
             if worst_effectiveness >= 2.0 and current_hp_pct < 40:
-                # Find a better matchup in party
-                for i, party_member in enumerate(your_party):
-                    if not party_member or i == 0:  # Skip empty slots and current Pokemon
-                        continue
-
-                    member_hp_pct = party_member.get('hp_percentage', 0)
-                    if member_hp_pct < 25:  # Skip weak Pokemon
-                        continue
-
-                    member_types = party_member.get('types', ['Normal'])
-
-                    # Calculate how effective opponent's moves are against this Pokemon
-                    member_effectiveness = 1.0
-                    for opp_type in opponent_types:
-                        effectiveness = self.get_type_effectiveness(opp_type, member_types)
-                        if effectiveness > member_effectiveness:
-                            member_effectiveness = effectiveness
+                # Candidate switch-ins: skip empty slots, the current Pokemon and weak Pokemon
+                candidates = [
+                    (i, party_member)
+                    for i, party_member in enumerate(your_party)
+                    if party_member and i != 0 and party_member.get('hp_percentage', 0) >= 25
+                ]
+
+                # Score how effective opponent's moves are against every candidate at once
+                member_threats = _party_threats(
+                    opponent_types,
+                    [party_member.get('types', ['Normal']) for _, party_member in candidates]
+                )
 
+                # Find a better matchup in party
+                for (i, party_member), member_effectiveness in zip(candidates, member_threats, strict=True):
                     # If this Pokemon resists opponent better, recommend switch
                     if member_effectiveness < worst_effectiveness:
                         reasoning = (
@@ -356,6 +549,43 @@ class BattleAnalyzer:
         Returns:
             Formatted battle analysis string
         """
+        # Consecutive ticks usually see the same battle state; reuse the analysis
+        try:
+            cache_key = (
+                _freeze_fields(your_pokemon, ('hp_percentage', 'types')),
+                _freeze_fields(opponent_pokemon, ('types',)),
+                tuple(_freeze_fields(m, ('name', 'type', 'power', 'pp')) for m in available_moves or ()),
+                tuple(
+                    _freeze_fields(p, ('species', 'hp_percentage', 'types')) for p in your_party
+                ) if your_party else None,
+            )
+            hash(cache_key)
+        except Exception:
+            cache_key = None  # Unusual input; analyze without caching
+
+        if cache_key is not None and cache_key in self._analysis_cache:
+            self._analysis_cache.move_to_end(cache_key)
+            return self._analysis_cache[cache_key]
+
+        analysis = self._format_battle_analysis(
+            your_pokemon, opponent_pokemon, available_moves, your_party
+        )
+
+        if cache_key is not None:
+            self._analysis_cache[cache_key] = analysis
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+
+        return analysis
+
+    def _format_battle_analysis(
+        self,
+        your_pokemon: Dict[str, Any],
+        opponent_pokemon: Dict[str, Any],
+        available_moves: List[Dict[str, Any]],
+        your_party: List[Dict[str, Any]] = None
+    ) -> str:
+        """Uncached body of format_battle_analysis"""
         lines = ["🎯 BATTLE ANALYSIS:"]
 
         # Best move recommendation
@@ -19,24 +19,145 @@ Competition Compliance:
 """
 
 import logging
-from dataclasses import dataclass, field
-from typing import Dict, Set, Tuple, Optional, List, Any
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Set, Tuple, Optional, List, Any, BinaryIO
 from pathlib import Path
 import json
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Unreachable (x, y, direction) entries are packed into a single int:
+# 16 bits x | 16 bits y | 2 bits direction index. Coordinates are stored as
+# 16-bit two's complement, so only COORD_MIN..COORD_MAX round-trip.
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+COORD_MIN = -0x8000
+COORD_MAX = 0x7FFF
+
+
+def _is_packable(x: int, y: int) -> bool:
+    """Whether (x, y) fits the 16-bit fields of a packed key"""
+    return COORD_MIN <= x <= COORD_MAX and COORD_MIN <= y <= COORD_MAX
+
+
+def _pack_position(x: int, y: int, dir_idx: int) -> int:
+    """Pack a position + direction index into an int key"""
+    if not _is_packable(x, y):
+        raise ValueError(f"Position {(x, y)} outside packable range [{COORD_MIN}, {COORD_MAX}]")
+    return ((x & 0xFFFF) << 18) | ((y & 0xFFFF) << 2) | dir_idx
+
+
+def _unpack_position(key: int) -> Tuple[int, int, str]:
+    """Inverse of _pack_position, returning (x, y, direction)"""
+    x = (key >> 18) & 0xFFFF
+    y = (key >> 2) & 0xFFFF
+    # Coordinates are stored as 16-bit two's complement
+    if x >= 0x8000:
+        x -= 0x10000
+    if y >= 0x8000:
+        y -= 0x10000
+    return (x, y, DIRECTIONS[key & 0b11])
+
+
+def _pack_xy(position: Tuple[int, int]) -> int:
+    """Pack an (x, y) position into an int key for collision_states"""
+    return (position[0] << 16) | (position[1] & 0xFFFF)
+
+
+def _pack_positions(xs: np.ndarray, ys: np.ndarray, dirs: np.ndarray) -> np.ndarray:
+    """Vectorized _pack_position over arrays of candidates"""
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    dirs = np.asarray(dirs, dtype=np.int64)
+    return ((xs & 0xFFFF) << 18) | ((ys & 0xFFFF) << 2) | dirs
+
+
+def _reachable_mask_loop(keys: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+    """Binary-search each key in sorted_keys; True where the key is NOT present"""
+    n = keys.shape[0]
+    m = sorted_keys.shape[0]
+    out = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        key = keys[i]
+        lo = 0
+        hi = m
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if sorted_keys[mid] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        out[i] = not (lo < m and sorted_keys[lo] == key)
+    return out
+
+
+def _reachable_mask_numpy(keys: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+    """Vectorized fallback for _reachable_mask_loop when numba is unavailable"""
+    if sorted_keys.shape[0] == 0:
+        return np.ones(keys.shape[0], dtype=np.bool_)
+    idx = np.minimum(np.searchsorted(sorted_keys, keys), sorted_keys.shape[0] - 1)
+    return sorted_keys[idx] != keys
+
+
+if NUMBA_AVAILABLE:
+    _reachable_mask = njit(cache=True)(_reachable_mask_loop)
+else:
+    _reachable_mask = _reachable_mask_numpy
 
-@dataclass
+
+def _append_unreachable_keys(log_file: Path, keys: List[int]):
+    """Append packed keys to the unreachable positions log and clear the list"""
+    if not keys:
+        return
+    try:
+        with open(log_file, "ab") as f:
+            f.write(b"".join(key.to_bytes(8, "little") for key in keys))
+        keys.clear()
+    except Exception as e:
+        logger.warning(f"Failed to save unreachable positions: {e}")
+
+
+# Display strings for every 4-bit failed-direction mask, names sorted alphabetically
+_FAILED_NAMES_BY_MASK = tuple(
+    ", ".join(sorted(d for i, d in enumerate(DIRECTIONS) if mask >> i & 1))
+    for mask in range(16)
+)
+_UNTRIED_NAMES_BY_MASK = tuple(_FAILED_NAMES_BY_MASK[~mask & 0xF] for mask in range(16))
+
+
+@dataclass(slots=True)
 class CollisionState:
     """Track collision state at a specific location"""
 
     position: Tuple[int, int]
     collision_count: int = 0
     last_attempted_action: Optional[str] = None
-    failed_actions: Set[str] = field(default_factory=set)
+    failed_mask: int = 0  # Bit i set when DIRECTIONS[i] collided here
     timestamp: int = 0
 
+    def add_failed(self, dir_idx: int):
+        """Record that the direction with index dir_idx collided here"""
+        self.failed_mask |= 1 << dir_idx
+
+    def has_failed(self, dir_idx: int) -> bool:
+        """Whether the direction with index dir_idx has collided here"""
+        return bool(self.failed_mask >> dir_idx & 1)
+
+    @property
+    def failed_actions(self) -> Set[str]:
+        """Directions that have collided here"""
+        return {d for i, d in enumerate(DIRECTIONS) if self.failed_mask >> i & 1}
+
 
 class CollisionHandler:
     """
@@ -46,6 +167,9 @@ class CollisionHandler:
     to prevent the agent from getting stuck in navigation loops.
     """
 
+    # Minimum seconds between unreachable-position log writes
+    UNREACHABLE_FLUSH_INTERVAL = 5.0
+
     def __init__(
         self,
         consecutive_collision_limit: int = 5,
@@ -73,11 +197,21 @@ class CollisionHandler:
         self.last_position: Optional[Tuple[int, int]] = None
         self.last_action: Optional[str] = None
 
-        # Unreachable positions (persistent across session)
-        self.unreachable_positions: Set[Tuple[int, int, str]] = set()
-
-        # Collision state per position
-        self.collision_states: Dict[Tuple[int, int], CollisionState] = {}
+        # Unreachable position + direction keys, packed by _pack_position
+        # (persistent across session)
+        self.unreachable_positions: Set[int] = set()
+        # Per-position bitmask of unreachable direction indices, mirrors unreachable_positions
+        self._unreachable_mask: Dict[Tuple[int, int], int] = {}
+        # Append-only log of packed keys (little-endian uint64), opened on first append
+        self._unreachable_log: Optional[BinaryIO] = None
+        # Newly marked keys not yet written to the log (flushed by _maybe_flush)
+        self._pending_unreachable: List[int] = []
+        self._last_flush = time.monotonic()
+        # Sorted array mirror of unreachable_positions for batch queries, rebuilt lazily
+        self._sorted_unreachable: Optional[np.ndarray] = None
+
+        # Collision state per position, keyed by _pack_xy(position)
+        self.collision_states: Dict[int, CollisionState] = {}
 
         # Statistics
         self.total_collisions = 0
@@ -87,6 +221,18 @@ class CollisionHandler:
         # Load persistent data
         self._load_unreachable_positions()
 
+        # Write out any buffered unreachable positions when the handler is
+        # collected or at interpreter exit; the finalizer holds only the path
+        # and the pending list, never the handler itself
+        self._finalizer = weakref.finalize(
+            self, _append_unreachable_keys, self.cache_dir / "unreachable_positions.bin",
+            self._pending_unreachable,
+        )
+
+        # Compile the batch query kernel now so the first real call isn't slowed by JIT
+        if NUMBA_AVAILABLE:
+            _reachable_mask(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+
         logger.info(
             f"CollisionHandler initialized (collision_limit={consecutive_collision_limit}, "
             f"movement_reset={consecutive_movement_reset_threshold})"
@@ -94,34 +240,96 @@ class CollisionHandler:
 
     def _load_unreachable_positions(self):
         """Load unreachable positions from cache"""
-        cache_file = self.cache_dir / "unreachable_positions.json"
+        log_file = self.cache_dir / "unreachable_positions.bin"
+        legacy_file = self.cache_dir / "unreachable_positions.json"
         try:
-            if cache_file.exists():
-                with open(cache_file, "r") as f:
+            if log_file.exists():
+                keys = np.fromfile(log_file, dtype="<u8")
+                self.unreachable_positions = {int(key) for key in keys}
+            elif legacy_file.exists():
+                with open(legacy_file, "r") as f:
                     data = json.load(f)
-                    # Convert list of lists back to set of tuples
-                    self.unreachable_positions = {
-                        tuple(pos) for pos in data.get("unreachable_positions", [])
-                    }
-                logger.info(
-                    f"Loaded {len(self.unreachable_positions)} unreachable positions from cache"
-                )
+                # Convert [x, y, direction] lists back to packed keys
+                entries = data.get("unreachable_positions", [])
+                valid = [
+                    (x, y, direction) for x, y, direction in entries
+                    if direction in DIRECTION_INDEX and _is_packable(x, y)
+                ]
+                if len(valid) < len(entries):
+                    logger.warning(
+                        f"Dropped {len(entries) - len(valid)} out-of-range or non-direction "
+                        f"entries while migrating {legacy_file}"
+                    )
+                self.unreachable_positions = {
+                    _pack_position(x, y, DIRECTION_INDEX[direction]) for x, y, direction in valid
+                }
+                # Migrate the legacy JSON cache to the binary log
+                self._save_unreachable_positions()
+            else:
+                return
+
+            self._rebuild_unreachable_mask()
+            logger.info(
+                f"Loaded {len(self.unreachable_positions)} unreachable positions from cache"
+            )
         except Exception as e:
             logger.warning(f"Failed to load unreachable positions: {e}")
 
+    def _rebuild_unreachable_mask(self):
+        """Recompute the per-position direction bitmask from unreachable_positions"""
+        self._sorted_unreachable = None
+        self._unreachable_mask = {}
+        for key in self.unreachable_positions:
+            x, y, direction = _unpack_position(key)
+            self._unreachable_mask[(x, y)] = self._unreachable_mask.get((x, y), 0) | (
+                1 << DIRECTION_INDEX[direction]
+            )
+
     def _save_unreachable_positions(self):
-        """Save unreachable positions to cache"""
-        cache_file = self.cache_dir / "unreachable_positions.json"
+        """Rewrite (compact) the unreachable positions log from the in-memory set"""
+        log_file = self.cache_dir / "unreachable_positions.bin"
         try:
-            data = {
-                "unreachable_positions": [list(pos) for pos in self.unreachable_positions],
-                "total_abandoned": self.total_abandoned_positions,
-            }
-            with open(cache_file, "w") as f:
-                json.dump(data, f, indent=2)
+            # The full rewrite covers anything still buffered
+            self._pending_unreachable.clear()
+            self.close()
+            np.fromiter(
+                self.unreachable_positions, dtype="<u8", count=len(self.unreachable_positions)
+            ).tofile(log_file)
         except Exception as e:
             logger.warning(f"Failed to save unreachable positions: {e}")
 
+    def _maybe_flush(self, force: bool = False):
+        """
+        Append buffered unreachable positions to the log.
+
+        Writes happen at most every UNREACHABLE_FLUSH_INTERVAL seconds unless forced,
+        so collision storms don't hit the disk on every abandonment.
+        """
+        if not self._pending_unreachable:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.UNREACHABLE_FLUSH_INTERVAL:
+            return
+
+        try:
+            if self._unreachable_log is None:
+                self._unreachable_log = open(self.cache_dir / "unreachable_positions.bin", "ab")
+            self._unreachable_log.write(
+                b"".join(key.to_bytes(8, "little") for key in self._pending_unreachable)
+            )
+            self._unreachable_log.flush()
+            self._pending_unreachable.clear()
+            self._last_flush = now
+        except Exception as e:
+            logger.warning(f"Failed to save unreachable positions: {e}")
+
+    def close(self):
+        """Flush buffered positions and close the log (reopened on next write)"""
+        self._maybe_flush(force=True)
+        if self._unreachable_log is not None:
+            self._unreachable_log.close()
+            self._unreachable_log = None
+
     def record_movement(
         self, current_position: Tuple[int, int], action: str, moved: bool
     ) -> Dict[str, Any]:
@@ -145,23 +353,25 @@ class CollisionHandler:
             "recovery_suggestion": None,
         }
 
+        # Direction index for movement actions, None for buttons like A/B/START
+        dir_idx = DIRECTION_INDEX.get(action)
+        is_move = dir_idx is not None
+
         # Check if this position is already marked unreachable
-        pos_key = (current_position[0], current_position[1], action)
-        if pos_key in self.unreachable_positions:
+        if is_move and (
+            self._unreachable_mask.get(current_position, 0) >> dir_idx
+        ) & 1:
             result["is_unreachable"] = True
             result["recovery_suggestion"] = "AVOID_POSITION"
             logger.warning(
-                f"⚠️ Position {current_position} with action {action} is marked unreachable"
+                "⚠️ Position %s with action %s is marked unreachable", current_position, action
             )
             return result
 
         # Determine if collision occurred
         # Collision = attempted directional movement but position didn't change
-        collision = False
-        if action in ["UP", "DOWN", "LEFT", "RIGHT"]:
-            if not moved:
-                # Tried to move but stayed in place = collision
-                collision = True
+        # Tried to move but stayed in place = collision
+        collision = is_move and not moved
 
         if collision:
             # Collision detected
@@ -173,20 +383,23 @@ class CollisionHandler:
             result["consecutive_collisions"] = self.consecutive_collisions
 
             # Update collision state for this position
-            if current_position not in self.collision_states:
-                self.collision_states[current_position] = CollisionState(
+            state_key = _pack_xy(current_position)
+            state = self.collision_states.get(state_key)
+            if state is None:
+                state = self.collision_states[state_key] = CollisionState(
                     position=current_position
                 )
 
-            state = self.collision_states[current_position]
             state.collision_count += 1
             state.last_attempted_action = action
-            state.failed_actions.add(action)
+            state.add_failed(dir_idx)
 
             logger.warning(
-                f"🚧 Collision detected at {current_position} "
-                f"(consecutive: {self.consecutive_collisions}/{self.consecutive_collision_limit}, "
-                f"action: {action})"
+                "🚧 Collision detected at %s (consecutive: %d/%d, action: %s)",
+                current_position,
+                self.consecutive_collisions,
+                self.consecutive_collision_limit,
+                action,
             )
 
             # Check if we should abandon this position
@@ -195,8 +408,9 @@ class CollisionHandler:
                 result["should_abandon"] = True
                 result["recovery_suggestion"] = "ABANDON_PATH"
                 logger.error(
-                    f"❌ Too many consecutive collisions ({self.consecutive_collisions})! "
-                    f"Marking {current_position} as unreachable."
+                    "❌ Too many consecutive collisions (%d)! Marking %s as unreachable.",
+                    self.consecutive_collisions,
+                    current_position,
                 )
             else:
                 # Suggest recovery based on failed actions
@@ -206,7 +420,7 @@ class CollisionHandler:
 
         else:
             # Successful movement or non-movement action
-            if moved and action in ["UP", "DOWN", "LEFT", "RIGHT"]:
+            if moved and is_move:
                 self.consecutive_movements += 1
 
                 # Reset collision counter if enough successful movements
@@ -216,7 +430,8 @@ class CollisionHandler:
                 ):
                     if self.consecutive_collisions > 0:
                         logger.info(
-                            f"✅ Collision counter reset after {self.consecutive_movements} successful movements"
+                            "✅ Collision counter reset after %d successful movements",
+                            self.consecutive_movements,
                         )
                         self.total_recoveries += 1
                     self.consecutive_collisions = 0
@@ -232,19 +447,32 @@ class CollisionHandler:
 
     def _mark_unreachable(self, position: Tuple[int, int], action: str):
         """Mark a position + action combination as unreachable"""
-        pos_key = (position[0], position[1], action)
+        dir_idx = DIRECTION_INDEX[action]
+        if not _is_packable(*position):
+            # Would alias another position once packed; leave it unmarked
+            logger.warning("Not marking %s as unreachable: outside the cacheable range", position)
+            self.consecutive_collisions = 0
+            return
+        pos_key = _pack_position(position[0], position[1], dir_idx)
+        is_new = pos_key not in self.unreachable_positions
         self.unreachable_positions.add(pos_key)
+        self._sorted_unreachable = None
+        self._unreachable_mask[position] = self._unreachable_mask.get(position, 0) | (1 << dir_idx)
         self.total_abandoned_positions += 1
 
         # Reset consecutive collision counter
         self.consecutive_collisions = 0
 
-        # Save to persistent cache
-        self._save_unreachable_positions()
+        # Queue for the persistent cache
+        if is_new:
+            self._pending_unreachable.append(pos_key)
+            self._maybe_flush()
 
         logger.error(
-            f"❌ Marked position {position} with action {action} as unreachable "
-            f"(total unreachable: {len(self.unreachable_positions)})"
+            "❌ Marked position %s with action %s as unreachable (total unreachable: %d)",
+            position,
+            action,
+            len(self.unreachable_positions),
         )
 
     def _suggest_recovery(
@@ -260,23 +488,16 @@ class CollisionHandler:
         Returns:
             Recovery suggestion string
         """
-        if position not in self.collision_states:
+        state = self.collision_states.get(_pack_xy(position))
+        if state is None:
             return "TRY_ALTERNATE"
 
-        state = self.collision_states[position]
-
         # If all 4 directions failed, suggest abandoning
-        if len(state.failed_actions) >= 4:
+        if state.failed_mask == 0xF:
             return "ABANDON_PATH"
 
         # Suggest trying directions that haven't failed yet
-        all_directions = {"UP", "DOWN", "LEFT", "RIGHT"}
-        untried = all_directions - state.failed_actions
-
-        if untried:
-            return f"TRY_ALTERNATE: {', '.join(sorted(untried))}"
-
-        return "TRY_ALTERNATE"
+        return f"TRY_ALTERNATE: {_UNTRIED_NAMES_BY_MASK[state.failed_mask]}"
 
     def is_position_unreachable(
         self, position: Tuple[int, int], action: Optional[str] = None
@@ -291,15 +512,42 @@ class CollisionHandler:
         Returns:
             True if unreachable, False otherwise
         """
+        mask = self._unreachable_mask.get(position, 0)
         if action:
-            return (position[0], position[1], action) in self.unreachable_positions
+            dir_idx = DIRECTION_INDEX.get(action)
+            return dir_idx is not None and bool((mask >> dir_idx) & 1)
 
         # Check if any action at this position is unreachable
-        for direction in ["UP", "DOWN", "LEFT", "RIGHT"]:
-            if (position[0], position[1], direction) in self.unreachable_positions:
-                return True
+        return mask != 0
+
+    def filter_reachable(
+        self, xs: np.ndarray, ys: np.ndarray, dirs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Batch version of is_position_unreachable for planners probing many cells.
 
-        return False
+        Args:
+            xs: Candidate x coordinates
+            ys: Candidate y coordinates
+            dirs: Direction indices into DIRECTIONS for each candidate
+
+        Returns:
+            Boolean array, True where (x, y, direction) is NOT marked unreachable
+        """
+        if self._sorted_unreachable is None:
+            self._sorted_unreachable = np.sort(
+                np.fromiter(
+                    self.unreachable_positions, dtype=np.int64, count=len(self.unreachable_positions)
+                )
+            )
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        reachable = _reachable_mask(_pack_positions(xs, ys, dirs), self._sorted_unreachable)
+        # Out-of-range positions are never marked, but their packed keys could
+        # collide with in-range ones
+        out_of_range = (xs < COORD_MIN) | (xs > COORD_MAX) | (ys < COORD_MIN) | (ys > COORD_MAX)
+        reachable[out_of_range] = True
+        return reachable
 
     def get_safe_directions(
         self, position: Tuple[int, int]
@@ -313,11 +561,11 @@ class CollisionHandler:
         Returns:
             List of safe direction strings
         """
-        all_directions = ["UP", "DOWN", "LEFT", "RIGHT"]
+        mask = self._unreachable_mask.get(position, 0)
         safe = [
             direction
-            for direction in all_directions
-            if (position[0], position[1], direction) not in self.unreachable_positions
+            for dir_idx, direction in enumerate(DIRECTIONS)
+            if not (mask >> dir_idx) & 1
         ]
         return safe
 
@@ -331,40 +579,50 @@ class CollisionHandler:
         Returns:
             Warning string or None
         """
-        if position not in self.collision_states:
+        state = self.collision_states.get(_pack_xy(position))
+        if state is None:
             return None
 
-        state = self.collision_states[position]
         if state.collision_count == 0:
             return None
 
-        failed_str = ", ".join(sorted(state.failed_actions))
+        failed_str = _FAILED_NAMES_BY_MASK[state.failed_mask]
         return (
             f"⚠️ COLLISION HISTORY at {position}: "
             f"{state.collision_count} collisions, failed actions: {failed_str}"
         )
 
+    _STATUS_TEMPLATE = (
+        "COLLISION HANDLER STATUS\n"
+        + "=" * 50 + "\n"
+        "Consecutive Collisions: {consecutive_collisions}/{consecutive_collision_limit}\n"
+        "Consecutive Movements: {consecutive_movements}\n"
+        "Unreachable Positions: {unreachable_count}\n"
+        "Total Collisions: {total_collisions}\n"
+        "Total Recoveries: {total_recoveries}\n"
+        "Total Abandoned: {total_abandoned_positions}"
+    )
+
     def format_status(self) -> str:
         """Format current collision handler status for display"""
-        lines = [
-            "COLLISION HANDLER STATUS",
-            "=" * 50,
-            f"Consecutive Collisions: {self.consecutive_collisions}/{self.consecutive_collision_limit}",
-            f"Consecutive Movements: {self.consecutive_movements}",
-            f"Unreachable Positions: {len(self.unreachable_positions)}",
-            f"Total Collisions: {self.total_collisions}",
-            f"Total Recoveries: {self.total_recoveries}",
-            f"Total Abandoned: {self.total_abandoned_positions}",
-        ]
+        status = self._STATUS_TEMPLATE.format(
+            consecutive_collisions=self.consecutive_collisions,
+            consecutive_collision_limit=self.consecutive_collision_limit,
+            consecutive_movements=self.consecutive_movements,
+            unreachable_count=len(self.unreachable_positions),
+            total_collisions=self.total_collisions,
+            total_recoveries=self.total_recoveries,
+            total_abandoned_positions=self.total_abandoned_positions,
+        )
 
         # Show recent unreachable positions (last 5)
         if self.unreachable_positions:
-            lines.append("\nRecent Unreachable Positions:")
             recent = list(self.unreachable_positions)[-5:]
-            for pos in recent:
-                lines.append(f"  • {pos}")
+            status += "\n\nRecent Unreachable Positions:\n" + "\n".join(
+                f"  • {_unpack_position(key)}" for key in recent
+            )
 
-        return "\n".join(lines)
+        return status
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get collision handler statistics for metrics"""
@@ -385,11 +643,14 @@ class CollisionHandler:
         self.last_position = None
         self.last_action = None
         self.collision_states.clear()
+        self._maybe_flush(force=True)
         logger.info("Collision handler session reset")
 
     def clear_unreachable_positions(self):
         """Clear all unreachable positions (useful for testing or new game)"""
         self.unreachable_positions.clear()
+        self._sorted_unreachable = None
+        self._unreachable_mask.clear()
         self.total_abandoned_positions = 0
         self._save_unreachable_positions()
         logger.info("Cleared all unreachable positions")
@@ -412,6 +673,10 @@ def get_collision_handler(reset: bool = False) -> CollisionHandler:
     global _collision_handler_instance
 
     if reset or _collision_handler_instance is None:
+        # Flush and close the old handler first so the new one loads its positions
+        # and nothing stale is written after the replacement
+        if _collision_handler_instance is not None:
+            _collision_handler_instance.close()
         _collision_handler_instance = CollisionHandler()
 
     return _collision_handler_instance
@@ -15,13 +15,169 @@ import logging
 import random
 from collections import deque
 from typing import Dict, List, Set, Tuple, Optional, Any
-import heapq
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from pokemon_env.enums import MetatileBehavior
 from utils.map_formatter import format_tile_to_symbol
 
 logger = logging.getLogger(__name__)
 
+# Symbols the BFS can expand through: walkable tiles, doors, stairs, grass
+EXPLORABLE_SYMBOLS = ('.', 'S', 'D', '~', 'P')
+
+# Unexplored border kept around the memory window so that frontiers just
+# outside it (which can still touch an explored tile), and their 8 scored
+# neighbors, land inside the grid
+GRID_MARGIN = 2
+
+# Symbols format_tile_to_symbol can produce, used to size the symbol id space
+_FORMATTER_SYMBOLS = (
+    '.', '#', 'S', 'D', 'W', '~', 'PC', 'T', 'B', '?', 'F', 'C', '=', 't',
+    'O', '^', 'U', 'V', 'M', 'J', 'K', '↑', '↓', '←', '→', '↗', '↘', '↙', '↖',
+)
+
+# Formatter symbol for every MetatileBehavior id, before the tile-id 1023 and
+# NORMAL-with-collision overrides (applied separately when building the grid).
+# format_tile_to_symbol only uses x/y/location_name together with stairs_pos,
+# which frontier detection never passes, so behavior alone decides the symbol.
+_MAX_BEHAVIOR_ID = int(max(MetatileBehavior))
+_BEHAVIOR_SYMBOLS = tuple(
+    format_tile_to_symbol((0, behavior, 0, 0)) for behavior in range(_MAX_BEHAVIOR_ID + 1)
+)
+
+# 8-directional neighbor offsets used for frontier scoring
+_NEIGHBOR_OFFSETS = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+)
+
+# 4-directional BFS expansion order (left, right, up, down)
+_BFS_DX = (-1, 1, 0, 0)
+_BFS_DY = (0, 0, -1, 1)
+
+
+def _bfs_frontiers_loop(
+    explorable: np.ndarray,
+    frontier: np.ndarray,
+    start_x: int,
+    start_y: int,
+    max_depth: int,
+    candidates: int,
+    visited: np.ndarray,
+    queue: np.ndarray,
+    found_cells: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    BFS over grid-local cells from (start_x, start_y) through explorable tiles.
+
+    Works in caller-owned buffers: `visited` is a cleared bool bitmap shaped
+    like the grid, `queue` an (H*W, 3) int32 array of (x, y, depth) entries
+    (each cell is enqueued at most once) and `found_cells` an (H*W, 2) int32
+    output. The caller guarantees the start is not on the outer ring. The
+    search stops early once all `candidates` frontier cells that it could
+    possibly dequeue have been found.
+
+    Returns:
+        (xs, ys, depth): frontier cells in discovery order (views into
+        found_cells), and the number of BFS levels processed
+    """
+    queue[0, 0] = start_x
+    queue[0, 1] = start_y
+    queue[0, 2] = 0
+    visited[start_y, start_x] = True
+    head = 0
+    tail = 1
+    found = 0
+    depth = 0
+
+    while head < tail:
+        x = queue[head, 0]
+        y = queue[head, 1]
+        d = queue[head, 2]
+        head += 1
+        if d >= max_depth:
+            continue
+        depth = d + 1
+
+        if frontier[y, x]:
+            found_cells[found, 0] = x
+            found_cells[found, 1] = y
+            found += 1
+            if found == candidates:
+                break
+
+        for k in range(4):
+            nx = x + _BFS_DX[k]
+            ny = y + _BFS_DY[k]
+            if not visited[ny, nx] and explorable[ny, nx]:
+                visited[ny, nx] = True
+                queue[tail, 0] = nx
+                queue[tail, 1] = ny
+                queue[tail, 2] = d + 1
+                tail += 1
+
+    return found_cells[:found, 0], found_cells[:found, 1], depth
+
+
+def _bfs_frontiers_python(
+    explorable: np.ndarray,
+    frontier: np.ndarray,
+    start_x: int,
+    start_y: int,
+    max_depth: int,
+    candidates: int,
+    visited: np.ndarray,
+    queue: np.ndarray,
+    found_cells: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Pure-Python fallback for _bfs_frontiers_loop when numba is unavailable.
+
+    The array buffers are accepted for signature compatibility but unused;
+    nested lists and a deque are faster than NumPy scalar access from Python.
+    """
+    # Nested lists index much faster than NumPy scalars from Python
+    explorable_rows = explorable.tolist()
+    frontier_rows = frontier.tolist()
+    visited = np.zeros(explorable.shape, dtype=bool).tolist()
+    visited[start_y][start_x] = True
+    queue = deque([(start_x, start_y, 0)])
+    out_x: List[int] = []
+    out_y: List[int] = []
+    depth = 0
+
+    while queue:
+        x, y, d = queue.popleft()
+        if d >= max_depth:
+            continue
+        depth = d + 1
+
+        if frontier_rows[y][x]:
+            out_x.append(x)
+            out_y.append(y)
+            if len(out_x) == candidates:
+                break
+
+        for dx, dy in zip(_BFS_DX, _BFS_DY, strict=True):
+            nx, ny = x + dx, y + dy
+            if not visited[ny][nx] and explorable_rows[ny][nx]:
+                visited[ny][nx] = True
+                queue.append((nx, ny, d + 1))
+
+    return np.array(out_x, dtype=np.int32), np.array(out_y, dtype=np.int32), depth
+
+
+if NUMBA_AVAILABLE:
+    _bfs_frontiers = njit(cache=True)(_bfs_frontiers_loop)
+else:
+    _bfs_frontiers = _bfs_frontiers_python
+
 
 class FrontierDetector:
     """
@@ -60,6 +216,43 @@ class FrontierDetector:
         '↗': 5, '↘': 5, '↙': 5, '↖': 5,
     }
 
+    # Score bonus for frontiers in the general direction of the current objective
+    OBJECTIVE_ALIGNMENT_BONUS = 30.0
+
+    # Small integer ids for grid symbols; '?' is id 0. Symbols outside this
+    # vocabulary share UNKNOWN_SYMBOL_ID (explored, not explorable, score 0)
+    SYMBOLS = ('?',) + tuple(sorted(
+        (set(TILE_SCORES) | set(_FORMATTER_SYMBOLS) | set(_BEHAVIOR_SYMBOLS) |
+         set(EXPLORABLE_SYMBOLS)) - {'?'}
+    ))
+    SYMBOL_IDS = {symbol: idx for idx, symbol in enumerate(SYMBOLS)}
+    UNKNOWN_SYMBOL_ID = len(SYMBOLS)
+    UNEXPLORED_SYMBOL_ID = SYMBOL_IDS['?']
+    WALL_SYMBOL_ID = SYMBOL_IDS['#']
+
+    # Explorable flag per symbol id (last slot: UNKNOWN_SYMBOL_ID), indexed by the id grid
+    EXPLORABLE_LUT = np.append(np.isin(SYMBOLS, EXPLORABLE_SYMBOLS), False)
+
+    __slots__ = (
+        'max_search_depth',
+        'max_frontiers_returned',
+        'distance_penalty_factor',
+        'enable_randomization',
+        'cache',
+        '_score_lut',
+        '_id_buffer',
+        '_visited_buffer',
+        '_queue_buffer',
+        '_found_buffer',
+        '_symbol_id_grid',
+        '_explored_mask',
+        '_explorable_mask',
+        '_frontier_mask',
+        '_neighbor_score_sum',
+        '_grid_origin_x',
+        '_grid_origin_y',
+    )
+
     def __init__(
         self,
         max_search_depth: int = 50,
@@ -81,9 +274,50 @@ class FrontierDetector:
         self.distance_penalty_factor = distance_penalty_factor
         self.enable_randomization = enable_randomization
 
-        self.visited_bfs = set()  # Tracks visited tiles during BFS
         self.cache = {}  # Cache for performance optimization
 
+        # Tile score per symbol id (last slot covers UNKNOWN_SYMBOL_ID)
+        self._score_lut = np.array(
+            [self.TILE_SCORES.get(symbol, 0) for symbol in self.SYMBOLS] + [0],
+            dtype=np.float64
+        )
+
+        # Per-call tile lookup state (only populated while detect_frontiers runs)
+        self._symbol_id_grid: Optional[np.ndarray] = None
+        self._explored_mask: Optional[np.ndarray] = None
+        self._explorable_mask: Optional[np.ndarray] = None
+        self._frontier_mask: Optional[np.ndarray] = None
+        self._neighbor_score_sum: Optional[np.ndarray] = None
+        self._grid_origin_x = 0
+        self._grid_origin_y = 0
+
+        # Grid and BFS buffers reused across calls, sized for the standard
+        # 15x15 memory window and reallocated only if the window shape changes
+        self._allocate_buffers((15 + 2 * GRID_MARGIN, 15 + 2 * GRID_MARGIN))
+
+        # Compile the BFS kernel now so the first detection isn't slowed by JIT
+        if NUMBA_AVAILABLE:
+            warmup = np.ones((3, 3), dtype=np.bool_)
+            _bfs_frontiers(
+                warmup, warmup, 1, 1, 1, 1,
+                np.zeros((3, 3), dtype=np.bool_),
+                np.empty((9, 3), dtype=np.int32),
+                np.empty((9, 2), dtype=np.int32)
+            )
+
+    def _allocate_buffers(self, shape: Tuple[int, int]) -> None:
+        """
+        (Re)allocate the per-call grid and BFS buffers for a grid shape.
+
+        Args:
+            shape: (rows, columns) of the padded symbol grid
+        """
+        cells = shape[0] * shape[1]
+        self._id_buffer = np.zeros(shape, dtype=np.int8)
+        self._visited_buffer = np.zeros(shape, dtype=np.bool_)
+        self._queue_buffer = np.empty((cells, 3), dtype=np.int32)
+        self._found_buffer = np.empty((cells, 2), dtype=np.int32)
+
     def detect_frontiers(
         self,
         game_state: Dict[str, Any],
@@ -126,27 +360,77 @@ class FrontierDetector:
             logger.debug("Map data corrupted or too small for frontier detection (transition?)")
             return []
 
-        # Find a good starting point for BFS (prefer center of explored area)
-        start_pos = self._find_exploration_start(game_state, player_pos)
-        if not start_pos:
-            logger.warning("Could not find starting point for frontier detection")
-            return []
-
-        # Perform BFS to find all frontiers
-        frontiers = self._run_frontier_bfs(
-            start_pos=start_pos,
-            game_state=game_state,
-            player_pos=player_pos,
-            unreachable=unreachable,
-            current_objective=current_objective
+        # Resolve every tile in the memory window once; lookups become array reads
+        player = game_state.get('player', {})
+        self._build_symbol_grid(
+            raw_tiles,
+            player.get('x', 0),
+            player.get('y', 0)
         )
+        try:
+            # Find a good starting point for BFS (prefer center of explored area)
+            start_pos = self._find_exploration_start(game_state, player_pos)
+            if not start_pos:
+                logger.warning("Could not find starting point for frontier detection")
+                return []
+
+            # Perform BFS to find all frontiers
+            scores, xs, ys = self._run_frontier_bfs(
+                start_pos=start_pos,
+                game_state=game_state,
+                player_pos=player_pos,
+                unreachable=unreachable,
+                current_objective=current_objective
+            )
+        finally:
+            self._symbol_id_grid = None
+            self._explored_mask = None
+            self._explorable_mask = None
+            self._frontier_mask = None
+            self._neighbor_score_sum = None
+
+        # Top N by score (highest first); ties keep BFS discovery order
+        top_frontiers = self._select_top_frontiers(scores, xs, ys)
+
+        logger.info(f"Detected {len(scores)} frontiers, returning top {len(top_frontiers)}")
+        return top_frontiers
+
+    def _select_top_frontiers(
+        self,
+        scores: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray
+    ) -> List[Tuple[float, int, int]]:
+        """
+        Pick the max_frontiers_returned best frontiers without a full sort.
 
-        # Sort by score (highest first) and return top N
-        frontiers.sort(key=lambda x: -x[0])  # Sort by score descending
-        top_frontiers = frontiers[:self.max_frontiers_returned]
+        A partition finds the k-th best score in O(N); only the selected k
+        entries are then sorted. Equal scores keep BFS discovery order, both
+        at the selection cutoff and in the final ordering.
 
-        logger.info(f"Detected {len(frontiers)} frontiers, returning top {len(top_frontiers)}")
-        return top_frontiers
+        Args:
+            scores: Frontier scores in BFS discovery order
+            xs: Frontier X coordinates
+            ys: Frontier Y coordinates
+
+        Returns:
+            List of (score, x, y) tuples sorted by score (descending)
+        """
+        n = len(scores)
+        k = min(self.max_frontiers_returned, n)
+        if k <= 0:
+            return []
+
+        if k < n:
+            threshold = np.partition(scores, n - k)[n - k]
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+            idx = np.concatenate((above, ties))
+        else:
+            idx = np.arange(n)
+
+        idx = idx[np.lexsort((idx, -scores[idx]))]
+        return list(zip(scores[idx].tolist(), xs[idx].tolist(), ys[idx].tolist(), strict=True))
 
     def _find_exploration_start(
         self,
@@ -168,8 +452,6 @@ class FrontierDetector:
         Returns:
             (x, y) starting position for BFS
         """
-        map_data = game_state.get('map', {})
-
         # Try random tiles near player (within 10 tile radius)
         attempts = 20 if self.enable_randomization else 1
         for _ in range(attempts):
@@ -182,7 +464,7 @@ class FrontierDetector:
             x, y = player_pos[0] + dx, player_pos[1] + dy
 
             # Check if this tile is explored and walkable
-            if self._is_tile_explored(x, y, game_state):
+            if self._is_tile_explored(x, y):
                 return (x, y)
 
         # Fallback to player position
@@ -195,10 +477,14 @@ class FrontierDetector:
         player_pos: Tuple[int, int],
         unreachable: Set[Tuple[int, int]],
         current_objective: Optional[Tuple[int, int]]
-    ) -> List[Tuple[float, int, int]]:
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Run BFS to find all frontier points and score them.
 
+        Expects the symbol grid from _build_symbol_grid; the search runs in
+        grid-local coordinates with a boolean visited bitmap. Reachable
+        frontiers are collected first and scored in one batch.
+
         Args:
             start_pos: Starting position for BFS
             game_state: Current game state
@@ -207,85 +493,70 @@ class FrontierDetector:
             current_objective: Current objective position (optional)
 
         Returns:
-            List of (score, x, y) tuples
+            (scores, xs, ys) arrays in BFS discovery order
         """
-        frontiers = []
-        self.visited_bfs = set()
-        queue = deque([start_pos])
-        self.visited_bfs.add(start_pos)
-        depth = 0
-
-        while queue and depth < self.max_search_depth:
-            level_size = len(queue)
-
-            for _ in range(level_size):
-                x, y = queue.popleft()
-
-                # Check if this position is a frontier
-                if self._is_frontier(x, y, game_state):
-                    if (x, y) not in unreachable:
-                        score = self._score_frontier(
-                            x, y, game_state, player_pos, current_objective
-                        )
-                        frontiers.append((score, x, y))
-
-                # Add unvisited walkable neighbors to queue (4-directional)
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    nx, ny = x + dx, y + dy
-
-                    if (nx, ny) not in self.visited_bfs:
-                        # Add to queue if it's a valid tile to explore from
-                        if self._is_tile_explorable(nx, ny, game_state):
-                            self.visited_bfs.add((nx, ny))
-                            queue.append((nx, ny))
-
-            depth += 1
-
-        logger.debug(f"BFS completed at depth {depth}, found {len(frontiers)} frontiers")
-        return frontiers
-
-    def _is_frontier(
-        self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any]
-    ) -> bool:
-        """
-        Check if a position is a frontier point.
-
-        A frontier is an unvisited tile that has at least one visited neighbor.
-        This represents the boundary between explored and unexplored regions.
-
-        Args:
-            x: X coordinate
-            y: Y coordinate
-            game_state: Current game state
-
-        Returns:
-            True if position is a frontier
-        """
-        # Must be unexplored
-        if not self._is_tile_unexplored(x, y, game_state):
-            return False
-
-        # Must have at least one explored neighbor (4-directional)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if self._is_tile_explored(nx, ny, game_state):
-                return True
-
-        return False
-
-    def _score_frontier(
+        explorable = self._explorable_mask
+        height, width = explorable.shape
+        origin_x = self._grid_origin_x
+        origin_y = self._grid_origin_y
+
+        start_x = start_pos[0] - origin_x
+        start_y = start_pos[1] - origin_y
+        # Explorable tiles all lie inside the border, so a start on or past the
+        # outermost ring can neither be a frontier nor reach one
+        if not (0 < start_y < height - 1 and 0 < start_x < width - 1):
+            logger.debug("BFS start lies outside the map window, no frontiers reachable")
+            return self._empty_frontiers()
+
+        # Only the start and explorable tiles are ever dequeued, so those are the
+        # only frontiers the BFS can report; stop as soon as all are found
+        frontier = self._frontier_mask
+        candidates = int(np.count_nonzero(frontier & explorable))
+        if frontier[start_y, start_x] and not explorable[start_y, start_x]:
+            candidates += 1
+        if candidates == 0:
+            logger.debug("No reachable frontier candidates in the map window")
+            return self._empty_frontiers()
+
+        visited = self._visited_buffer
+        visited.fill(False)
+        local_xs, local_ys, depth = _bfs_frontiers(
+            explorable, frontier, start_x, start_y, self.max_search_depth, candidates,
+            visited, self._queue_buffer, self._found_buffer
+        )
+        xs = local_xs.astype(np.int64) + origin_x
+        ys = local_ys.astype(np.int64) + origin_y
+
+        if unreachable and len(xs):
+            keep = np.array(
+                [(x, y) not in unreachable for x, y in zip(xs.tolist(), ys.tolist(), strict=True)],
+                dtype=bool
+            )
+            xs = xs[keep]
+            ys = ys[keep]
+
+        logger.debug(f"BFS completed at depth {depth}, found {len(xs)} frontiers")
+        if not len(xs):
+            return self._empty_frontiers()
+
+        scores = self._score_frontiers(xs, ys, player_pos, current_objective)
+        return scores, xs, ys
+
+    @staticmethod
+    def _empty_frontiers() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Empty (scores, xs, ys) result for _run_frontier_bfs."""
+        empty = np.empty(0, dtype=np.int64)
+        return np.empty(0, dtype=np.float64), empty, empty
+
+    def _score_frontiers(
         self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any],
+        xs: np.ndarray,
+        ys: np.ndarray,
         player_pos: Tuple[int, int],
         current_objective: Optional[Tuple[int, int]]
-    ) -> float:
+    ) -> np.ndarray:
         """
-        Score a frontier based on surrounding tiles and other factors.
+        Score a batch of frontiers based on surrounding tiles and other factors.
 
         Scoring factors:
         1. Surrounding tile types (8-directional)
@@ -294,196 +565,176 @@ class FrontierDetector:
         4. Random factor for exploration diversity
 
         Args:
-            x: Frontier X coordinate
-            y: Frontier Y coordinate
-            game_state: Current game state
+            xs: Frontier X coordinates (must lie inside the symbol grid)
+            ys: Frontier Y coordinates
             player_pos: Player position
             current_objective: Current objective position (optional)
 
         Returns:
-            Float score (higher is better)
+            Float scores aligned with xs/ys (higher is better)
         """
-        score = 0.0
-
         # 1. Base score from surrounding tiles (8-directional)
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-
-                neighbor_score = self._get_tile_score(x + dx, y + dy, game_state)
-                score += neighbor_score
+        scores = self._neighbor_score_sum[ys - self._grid_origin_y, xs - self._grid_origin_x]
 
         # 2. Distance penalty (prefer closer frontiers)
-        distance = abs(x - player_pos[0]) + abs(y - player_pos[1])
-        score -= distance * self.distance_penalty_factor
+        to_frontier_x = xs - player_pos[0]
+        to_frontier_y = ys - player_pos[1]
+        distance = np.abs(to_frontier_x) + np.abs(to_frontier_y)
+        scores -= distance * self.distance_penalty_factor
 
         # 3. Objective alignment bonus
         if current_objective:
-            # Calculate if frontier is in the general direction of objective
-            obj_x, obj_y = current_objective
-
-            # Direction vectors
-            to_frontier_x = x - player_pos[0]
-            to_frontier_y = y - player_pos[1]
-            to_objective_x = obj_x - player_pos[0]
-            to_objective_y = obj_y - player_pos[1]
-
-            # Dot product to measure alignment
-            dot_product = (to_frontier_x * to_objective_x +
-                          to_frontier_y * to_objective_y)
-
-            if dot_product > 0:  # Same general direction
-                score += 30  # Bonus for objective alignment
+            # Frontier is in the general direction of the objective when the
+            # player->frontier and player->objective vectors have a positive dot product
+            to_objective_x = current_objective[0] - player_pos[0]
+            to_objective_y = current_objective[1] - player_pos[1]
+            dot_product = to_frontier_x * to_objective_x + to_frontier_y * to_objective_y
+            scores += np.where(dot_product > 0, self.OBJECTIVE_ALIGNMENT_BONUS, 0.0)
 
         # 4. Small random factor for diversity (if enabled)
         if self.enable_randomization:
-            score += random.uniform(-2, 2)
+            scores += np.random.uniform(-2, 2, size=len(scores))
 
-        return score
+        return scores
 
-    def _get_tile_score(
+    def _build_symbol_grid(
         self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any]
-    ) -> float:
+        raw_tiles: List[Any],
+        player_x: int,
+        player_y: int
+    ) -> np.ndarray:
         """
-        Get the score for a specific tile based on its type.
+        Resolve the symbol id of every tile in the memory window in one pass.
 
-        Args:
-            x: X coordinate
-            y: Y coordinate
-            game_state: Current game state
+        The grid covers the raw tile rows plus a GRID_MARGIN border of '?'.
+        Tiles beyond that still read as '?' via the bounds check in the
+        lookup helpers. The explored, explorable and frontier masks are
+        derived from the grid here as well.
 
-        Returns:
-            Float score for this tile type
-        """
-        # Get tile symbol
-        symbol = self._get_tile_symbol(x, y, game_state)
-
-        # Return score from lookup table
-        return self.TILE_SCORES.get(symbol, 0)
-
-    def _get_tile_symbol(
-        self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any]
-    ) -> str:
-        """
-        Get the symbol representing a tile at position (x, y).
-
-        This integrates with the existing map formatter to get consistent symbols.
+        Tiles with integer fields are resolved through BEHAVIOR_TO_SYMBOL_ID
+        (plus the formatter's tile-id 1023 and collision overrides); anything
+        else goes through format_tile_to_symbol individually.
 
         Args:
-            x: X coordinate
-            y: Y coordinate
-            game_state: Current game state
+            raw_tiles: 15x15 memory tile rows centered on the player
+            player_x: Player X coordinate the window is centered on
+            player_y: Player Y coordinate the window is centered on
 
         Returns:
-            String symbol ('.', '#', 'G', 'C', etc.)
+            2D array of symbol ids indexed by (row, column) relative to the window origin
         """
-        map_data = game_state.get('map', {})
-        raw_tiles = map_data.get('tiles', [])
-
-        if not raw_tiles:
-            return '#'  # Unknown = wall
-
-        # Get player position to calculate relative tile position
-        player_x = game_state.get('player', {}).get('x', 0)
-        player_y = game_state.get('player', {}).get('y', 0)
-
-        # Memory tiles are 15x15 centered on player
-        radius = 7
-        rel_x = x - player_x + radius
-        rel_y = y - player_y + radius
-
-        # Check bounds
-        if rel_y < 0 or rel_y >= len(raw_tiles):
-            return '?'  # Out of bounds = unexplored
-        if rel_x < 0 or rel_x >= len(raw_tiles[rel_y]):
-            return '?'  # Out of bounds = unexplored
-
-        tile_data = raw_tiles[rel_y][rel_x]
-
-        if not tile_data or len(tile_data) < 2:
-            return '?'  # No data = unexplored
-
-        # Use existing formatter to get symbol
-        location_name = game_state.get('player', {}).get('location')
-        symbol = format_tile_to_symbol(
-            tile_data,
-            x=x,
-            y=y,
-            location_name=location_name
-        )
-
-        return symbol
-
-    def _is_tile_unexplored(
-        self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any]
-    ) -> bool:
+        margin = GRID_MARGIN
+        window_x = player_x - 7
+        window_y = player_y - 7
+        height = len(raw_tiles)
+        width = max((len(row) for row in raw_tiles), default=0)
+
+        shape = (height + 2 * margin, width + 2 * margin)
+        if self._id_buffer.shape != shape:
+            self._allocate_buffers(shape)
+        id_grid = self._id_buffer
+        id_grid.fill(self.UNEXPLORED_SYMBOL_ID)
+
+        # Split tile fields into flat arrays; odd tiles get resolved one by one
+        cells: List[int] = []
+        tile_ids: List[int] = []
+        behaviors: List[int] = []
+        collisions: List[int] = []
+        odd_tiles: List[Tuple[int, Any]] = []
+        for row_idx, row in enumerate(raw_tiles):
+            row_base = (row_idx + margin) * shape[1] + margin
+            for col_idx, tile_data in enumerate(row):
+                if not tile_data or len(tile_data) < 2:
+                    continue  # No data = unexplored
+                if len(tile_data) >= 4:
+                    tile_id, behavior, collision, _ = tile_data
+                else:
+                    tile_id, behavior = tile_data[:2]
+                    collision = 0
+                if (isinstance(behavior, int) and 0 <= behavior <= _MAX_BEHAVIOR_ID
+                        and isinstance(tile_id, int) and isinstance(collision, int)):
+                    cells.append(row_base + col_idx)
+                    tile_ids.append(tile_id)
+                    behaviors.append(behavior)
+                    collisions.append(collision)
+                else:
+                    odd_tiles.append((row_base + col_idx, tile_data))
+
+        if cells:
+            behavior_arr = np.array(behaviors, dtype=np.int32)
+            symbol_ids = BEHAVIOR_TO_SYMBOL_ID[behavior_arr]
+            # Formatter overrides: NORMAL is a wall when it has collision,
+            # and tile id 1023 is always a wall
+            blocked = (behavior_arr == MetatileBehavior.NORMAL) & (np.array(collisions) != 0)
+            blocked |= np.array(tile_ids) == 1023
+            symbol_ids[blocked] = self.WALL_SYMBOL_ID
+            id_grid.flat[cells] = symbol_ids
+
+        for cell, tile_data in odd_tiles:
+            symbol = format_tile_to_symbol(tile_data)
+            id_grid.flat[cell] = self.SYMBOL_IDS.get(symbol, self.UNKNOWN_SYMBOL_ID)
+        origin_x = window_x - margin
+        origin_y = window_y - margin
+
+        explored = id_grid != self.UNEXPLORED_SYMBOL_ID
+
+        # Frontier: unexplored tile with at least one explored 4-neighbor
+        has_explored_neighbor = np.zeros_like(explored)
+        has_explored_neighbor[1:] |= explored[:-1]
+        has_explored_neighbor[:-1] |= explored[1:]
+        has_explored_neighbor[:, 1:] |= explored[:, :-1]
+        has_explored_neighbor[:, :-1] |= explored[:, 1:]
+
+        self._symbol_id_grid = id_grid
+        self._grid_origin_x = origin_x
+        self._grid_origin_y = origin_y
+        self._explored_mask = explored
+        self._explorable_mask = self.EXPLORABLE_LUT[id_grid]
+        self._frontier_mask = ~explored & has_explored_neighbor
+
+        # Per-tile scores, then the 8-neighbor sum via shifted slices of a
+        # zero-padded copy (only the outer ring sees the zero padding)
+        scores = self._score_lut[id_grid]
+        padded = np.pad(scores, 1)
+        neighbor_sum = np.zeros_like(scores)
+        rows, cols = scores.shape
+        for dx, dy in _NEIGHBOR_OFFSETS:
+            neighbor_sum += padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+        self._neighbor_score_sum = neighbor_sum
+        return id_grid
+
+    def _grid_mask_value(self, mask: np.ndarray, x: int, y: int) -> bool:
         """
-        Check if a tile is unexplored (outside visible range or unknown).
+        Read a per-tile mask at world (x, y); tiles outside the window are False.
 
         Args:
+            mask: Boolean mask aligned with the symbol grid
             x: X coordinate
             y: Y coordinate
-            game_state: Current game state
 
         Returns:
-            True if tile is unexplored
+            Mask value at (x, y)
         """
-        symbol = self._get_tile_symbol(x, y, game_state)
-        return symbol == '?'
+        rel_x = x - self._grid_origin_x
+        rel_y = y - self._grid_origin_y
+        if 0 <= rel_y < mask.shape[0] and 0 <= rel_x < mask.shape[1]:
+            return bool(mask[rel_y, rel_x])
+        return False
 
-    def _is_tile_explored(
-        self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any]
-    ) -> bool:
+    def _is_tile_explored(self, x: int, y: int) -> bool:
         """
         Check if a tile has been explored (is in visible range).
 
-        Args:
-            x: X coordinate
-            y: Y coordinate
-            game_state: Current game state
-
-        Returns:
-            True if tile is explored
-        """
-        symbol = self._get_tile_symbol(x, y, game_state)
-        return symbol != '?'
-
-    def _is_tile_explorable(
-        self,
-        x: int,
-        y: int,
-        game_state: Dict[str, Any]
-    ) -> bool:
-        """
-        Check if a tile can be used for exploration (walkable and explored).
+        Expects the masks from _build_symbol_grid.
 
         Args:
             x: X coordinate
             y: Y coordinate
-            game_state: Current game state
 
         Returns:
-            True if tile is explorable (can BFS from it)
+            True if tile is explored
         """
-        symbol = self._get_tile_symbol(x, y, game_state)
-
-        # Can explore from: walkable tiles, doors, stairs
-        # Cannot explore from: walls, water, unexplored
-        explorable_symbols = ['.', 'S', 'D', '~', 'P']
-        return symbol in explorable_symbols
+        return self._grid_mask_value(self._explored_mask, x, y)
 
     def format_frontiers_for_prompt(
         self,
@@ -514,6 +765,12 @@ class FrontierDetector:
         return "\n".join(lines)
 
 
+# Symbol id per MetatileBehavior id, so a whole window resolves in one gather
+BEHAVIOR_TO_SYMBOL_ID = np.array(
+    [FrontierDetector.SYMBOL_IDS[symbol] for symbol in _BEHAVIOR_SYMBOLS], dtype=np.int8
+)
+
+
 def create_frontier_detector(config: Optional[Dict[str, Any]] = None) -> FrontierDetector:
     """
     Factory function to create a FrontierDetector with configuration.
@@ -8,11 +8,16 @@ Uses intelligent summarization to batch similar consecutive actions.
 """
 
 import logging
-from typing import List, Dict, Any
-from collections import defaultdict
+from typing import List, Dict, Any, Iterator
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
+MOVEMENT_ACTIONS = frozenset(("UP", "DOWN", "LEFT", "RIGHT"))
+
+# Bound on memoized action_taken strings (they carry free-form reasoning)
+ACTION_WORD_CACHE_SIZE = 4096
+
 
 class HistoryCompressor:
     """
@@ -21,6 +26,8 @@ class HistoryCompressor:
     Keeps recent entries in full detail, summarizes older entries.
     """
 
+    __slots__ = ('full_detail_count', 'summary_batch_size', '_action_word_cache')
+
     def __init__(self, full_detail_count: int = 20, summary_batch_size: int = 10):
         """
         Initialize history compressor.
@@ -32,6 +39,9 @@ class HistoryCompressor:
         self.full_detail_count = full_detail_count
         self.summary_batch_size = summary_batch_size
 
+        # action_taken -> first action word; history is re-summarized every step
+        self._action_word_cache: Dict[str, str] = {}
+
     def compress_history(self, history_entries: List[Any]) -> str:
         """
         Compress history entries into a compact string representation.
@@ -51,25 +61,25 @@ class HistoryCompressor:
         recent_entries = history_entries[-self.full_detail_count:]
         old_entries = history_entries[:-self.full_detail_count] if total_entries > self.full_detail_count else []
 
-        lines = []
+        return "\n".join(self._iter_lines(recent_entries, old_entries))
 
+    def _iter_lines(self, recent_entries: List[Any], old_entries: List[Any]) -> Iterator[str]:
+        """Yield the lines of the compressed history, oldest summary first"""
         # Summarize old entries if they exist
         if old_entries:
             summary = self._summarize_old_entries(old_entries)
-            lines.append(f"[Earlier: {summary}]")
-            lines.append("")  # Blank line separator
+            yield f"[Earlier: {summary}]"
+            yield ""  # Blank line separator
 
         # Show recent entries in full detail
-        lines.append("RECENT HISTORY:")
+        yield "RECENT HISTORY:"
         for i, entry in enumerate(recent_entries, 1):
             coord_str = f"({entry.player_coords[0]},{entry.player_coords[1]})" if entry.player_coords else "(?)"
 
             # Simplified action display (remove reasoning for brevity)
             action = entry.action_taken.split("|")[0].strip() if "|" in entry.action_taken else entry.action_taken
 
-            lines.append(f"{i}. {entry.context} @ {coord_str}: {action}")
-
-        return "\n".join(lines)
+            yield f"{i}. {entry.context} @ {coord_str}: {action}"
 
     def _summarize_old_entries(self, old_entries: List[Any]) -> str:
         """
@@ -80,52 +90,49 @@ class HistoryCompressor:
         if not old_entries:
             return ""
 
-        # Batch entries and create summaries
-        batches = self._create_batches(old_entries, self.summary_batch_size)
+        # Summarize each batch as an index window over old_entries (no sub-lists)
+        batch_size = self.summary_batch_size
+        total = len(old_entries)
 
         summaries = []
-        for batch_start, batch_end, batch_entries in batches:
-            summary = self._summarize_batch(batch_entries)
-            summaries.append(f"Actions {batch_start}-{batch_end}: {summary}")
-
-        return " | ".join(summaries)
-
-    def _create_batches(self, entries: List[Any], batch_size: int) -> List[tuple]:
-        """Create batches of entries for summarization"""
-        batches = []
-        total = len(entries)
-
         for i in range(0, total, batch_size):
-            batch = entries[i:i + batch_size]
-            batch_start = i + 1
             batch_end = min(i + batch_size, total)
-            batches.append((batch_start, batch_end, batch))
+            summary = self._summarize_batch(old_entries, i, batch_end)
+            summaries.append(f"Actions {i + 1}-{batch_end}: {summary}")
 
-        return batches
+        return " | ".join(summaries)
 
-    def _summarize_batch(self, batch: List[Any]) -> str:
+    def _summarize_batch(self, entries: List[Any], start: int, stop: int) -> str:
         """
-        Summarize a batch of history entries.
+        Summarize the batch of history entries entries[start:stop].
 
         Identifies patterns:
         - Movement sequences (e.g., "moved UP 3 times")
         - Location changes (e.g., "traveled from X to Y")
         - Context changes (e.g., "entered battle, won")
         """
-        if not batch:
+        if start >= stop:
             return "empty"
 
         # Count action types
-        action_counts = defaultdict(int)
+        action_counts = Counter()
         contexts = []
         locations = []
         start_coords = None
         end_coords = None
 
-        for entry in batch:
-            # Extract action (remove reasoning)
-            action = entry.action_taken.split("|")[0].strip() if "|" in entry.action_taken else entry.action_taken
-            action_word = action.split()[0].split(",")[0]  # Get first action word
+        word_cache = self._action_word_cache
+        for idx in range(start, stop):
+            entry = entries[idx]
+            action_taken = entry.action_taken
+            action_word = word_cache.get(action_taken)
+            if action_word is None:
+                # First action word, with the reasoning after "|" removed
+                head = action_taken.partition("|")[0]
+                action_word = head.split(None, 1)[0].split(",", 1)[0]
+                if len(word_cache) >= ACTION_WORD_CACHE_SIZE:
+                    word_cache.clear()
+                word_cache[action_taken] = action_word
             action_counts[action_word] += 1
 
             # Track contexts
@@ -147,20 +154,27 @@ class HistoryCompressor:
         else:
             parts.append(f"{'/'.join(contexts)}")
 
+        # Split the count-ordered actions into movements and everything else;
+        # most_common is a stable sort, so ties keep first-seen order
+        movements = []
+        other_actions = []
+        for action, count in action_counts.most_common():
+            if action in MOVEMENT_ACTIONS:
+                movements.append((action, count))
+            else:
+                other_actions.append((action, count))
+
         # Movement summary
-        movements = {k: v for k, v in action_counts.items() if k in ["UP", "DOWN", "LEFT", "RIGHT"]}
         if movements:
-            move_summary = ", ".join([f"{k}×{v}" for k, v in sorted(movements.items(), key=lambda x: x[1], reverse=True)])
+            move_summary = ", ".join([f"{k}×{v}" for k, v in movements])
             parts.append(f"moved ({move_summary})")
 
         # Other actions
-        other_actions = {k: v for k, v in action_counts.items() if k not in ["UP", "DOWN", "LEFT", "RIGHT"]}
-        if other_actions:
-            for action, count in sorted(other_actions.items(), key=lambda x: x[1], reverse=True)[:3]:  # Top 3
-                if count > 1:
-                    parts.append(f"{action}×{count}")
-                else:
-                    parts.append(action)
+        for action, count in other_actions[:3]:  # Top 3
+            if count > 1:
+                parts.append(f"{action}×{count}")
+            else:
+                parts.append(action)
 
         # Coordinate change
         if start_coords and end_coords and start_coords != end_coords:
@@ -203,13 +217,8 @@ class HistoryCompressor:
         if not actions:
             return "none"
 
-        # Count each action type
-        action_counts = defaultdict(int)
-        for action in actions:
-            action_counts[action] += 1
-
-        # Create summary (top 5 most common)
-        top_actions = sorted(action_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Count each action type and keep the top 5 most common
+        top_actions = Counter(actions).most_common(5)
         summary_parts = [f"{action}×{count}" for action, count in top_actions]
 
         return ", ".join(summary_parts)
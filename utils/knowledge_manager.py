@@ -7,16 +7,78 @@ guidance and visual aids based on current game state and milestone.
 Part of the Knowledge Base Implementation Plan - Phase 3
 """
 
+import dataclasses
+import itertools
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from PIL import Image
 
-from utils.knowledge_parser import KnowledgeParser, KnowledgeSection
+from utils.knowledge_parser import (
+    ItemInfo,
+    KnowledgeParser,
+    KnowledgeSection,
+    PokemonEncounter,
+    TrainerInfo,
+)
 from utils.map_provider import MapProvider, MapData
 
 logger = logging.getLogger(__name__)
 
+# Game contexts whose guidance is pre-rendered at startup; others are
+# formatted on first use
+GUIDANCE_CONTEXTS = ("overworld", "battle", "dialogue", "menu", "title")
+
+# Guidance/strategy headers
+GUIDANCE_HEADER_PREFIX = "📚 SPEEDRUN KNOWLEDGE - "
+BATTLE_STRATEGY_HEADER = "⚔️  BATTLE STRATEGY:"
+
+# Contexts in which upcoming trainer battles are listed
+TRAINER_CONTEXTS = ("battle", "overworld")
+
+# Subsection titles worth surfacing (e.g. "Gym Leader Roxanne", "Birch's Lab")
+IMPORTANT_SUBSECTION_RE = re.compile("Gym Leader|Lab|Battle|Meet")
+
+# Upper bound on threads used to preload map images
+MAX_PRELOAD_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class ContextualKnowledge:
+    """Knowledge relevant to the current game state (collections reference the section's own)"""
+    current_section: Optional[KnowledgeSection] = None
+    map_image: Optional[Image.Image] = None
+    formatted_guidance: str = ""
+    objectives: List[str] = field(default_factory=list)
+    tips: List[str] = field(default_factory=list)
+    trainers_ahead: List[TrainerInfo] = field(default_factory=list)
+    items_available: Tuple[ItemInfo, ...] = ()
+    pokemon_available: Tuple[PokemonEncounter, ...] = ()
+
+    @classmethod
+    def for_section(
+        cls,
+        section: KnowledgeSection,
+        map_image: Optional[Image.Image] = None,
+        formatted_guidance: str = ""
+    ) -> "ContextualKnowledge":
+        """Build knowledge for a section without copying its collections"""
+        return cls(
+            current_section=section,
+            map_image=map_image,
+            formatted_guidance=formatted_guidance,
+            objectives=section.objectives,
+            tips=section.tips,
+            trainers_ahead=section.trainers,
+            items_available=section.items,
+            pokemon_available=section.available_pokemon,
+        )
+
 
 class KnowledgeManager:
     """
@@ -26,6 +88,9 @@ class KnowledgeManager:
     to provide comprehensive, context-aware guidance to the AI agent.
     """
 
+    # Number of resized map images kept for get_map_image
+    RESIZED_CACHE_SIZE = 8
+
     def __init__(
         self,
         knowledge_file: str = "data/knowledge/speedrun.md",
@@ -44,11 +109,40 @@ class KnowledgeManager:
         # Initialize components
         logger.info("Initializing KnowledgeManager...")
 
-        self.parser = KnowledgeParser(knowledge_file)
+        self.parser = KnowledgeParser(knowledge_file, use_cache=True)
         self.map_provider = MapProvider(maps_directory)
 
-        # Parse knowledge once at initialization
+        # Memoized get_contextual_knowledge results without their map image,
+        # keyed by (milestone_id, location, context); invalidated by clear_cache().
+        # Images are attached per call so only the MapProvider decides which stay loaded
+        self._ctx_cache: Dict[tuple, ContextualKnowledge] = {}
+        # Single-entry fast path: consecutive agent steps usually repeat the same
+        # (milestone_id, location, context, need_map)
+        self._last_ctx_key: Optional[tuple] = None
+        self._last_ctx_result: Optional[ContextualKnowledge] = None
+
+        # Map lookups keyed by (milestone_id, location), and the most recently
+        # used resized map images keyed by (milestone_id, location, max_size)
+        self._map_data_cache: Dict[tuple, Optional[MapData]] = {}
+        self._resized_cache: OrderedDict[tuple, Image.Image] = OrderedDict()
+
+        # Formatted guidance text keyed by (section_id, context, include_full_details)
+        self._guidance: Dict[tuple, str] = {}
+
+        # Parse knowledge once at initialization (the parser reuses its
+        # on-disk cache when the walkthrough is unchanged)
         self.sections = self.parser.parse_markdown()
+        self._sections_ro = MappingProxyType(self.sections)
+
+        # Section totals for get_stats(); sections don't change after parsing
+        self._section_totals = self._compute_section_totals()
+
+        # Sections never change after parsing, so render every guidance
+        # variant up front and turn formatting into a dict lookup
+        for sid, sec in self.sections.items():
+            for ctx in GUIDANCE_CONTEXTS:
+                for full in (True, False):
+                    self._guidance[(sid, ctx, full)] = self._format_section_guidance_impl(sec, ctx, full)
 
         logger.info(
             f"KnowledgeManager initialized: {len(self.sections)} sections, "
@@ -59,8 +153,9 @@ class KnowledgeManager:
         self,
         milestone_id: str,
         location: str,
-        context: str = "overworld"
-    ) -> Dict[str, Any]:
+        context: str = "overworld",
+        need_map: bool = True
+    ) -> ContextualKnowledge:
         """
         Get all relevant knowledge for the current game state.
 
@@ -68,79 +163,103 @@ class KnowledgeManager:
             milestone_id: Current agent milestone (e.g., "STARTER_CHOSEN")
             location: Game location ID (e.g., "ROUTE101")
             context: Game context (overworld, battle, dialogue, menu)
+            need_map: If False, skip the map lookup and leave map_image as None
 
         Returns:
-            Dictionary containing:
-                - current_section: KnowledgeSection object
-                - map_image: PIL Image or None
-                - formatted_guidance: Formatted text string
-                - objectives: List of objective strings
-                - tips: List of tip strings
-                - trainers_ahead: List of trainer info
-                - items_available: List of item info
-                - pokemon_available: List of Pokemon encounters
+            ContextualKnowledge (frozen; may be shared between calls with the
+            same arguments) containing the current section, map image,
+            formatted guidance and the section's objectives, tips, trainers,
+            items and Pokemon encounters
         """
-        result = {
-            'current_section': None,
-            'map_image': None,
-            'formatted_guidance': "",
-            'objectives': [],
-            'tips': [],
-            'trainers_ahead': [],
-            'items_available': [],
-            'pokemon_available': []
-        }
+        last_key = (milestone_id, location, context, need_map)
+        if last_key == self._last_ctx_key:
+            return self._last_ctx_result
 
-        try:
-            # Get knowledge section
-            section = None
+        key = (milestone_id, location, context)
+        cached = self._ctx_cache.get(key)
+        if cached is not None:
+            result = self._with_map_image(cached, milestone_id, location, need_map)
+            self._last_ctx_key, self._last_ctx_result = last_key, result
+            return result
 
+        section = None
+
+        try:
             # Try milestone first
             if milestone_id:
                 section = self.parser.get_section_by_milestone(milestone_id)
-                logger.debug(f"Found section by milestone {milestone_id}: {section.title if section else 'None'}")
+                logger.debug("Found section by milestone %s: %s", milestone_id, section.title if section else 'None')
 
             # Fallback to location
             if not section and location:
                 section = self.parser.get_section_by_location(location)
-                logger.debug(f"Found section by location {location}: {section.title if section else 'None'}")
+                logger.debug("Found section by location %s: %s", location, section.title if section else 'None')
 
             if not section:
-                logger.warning(f"No knowledge section found for milestone={milestone_id}, location={location}")
+                logger.warning("No knowledge section found for milestone=%s, location=%s", milestone_id, location)
+                result = ContextualKnowledge()
+                self._ctx_cache[key] = result
+                self._last_ctx_key, self._last_ctx_result = last_key, result
                 return result
 
-            result['current_section'] = section
-            result['objectives'] = section.objectives
-            result['tips'] = section.tips
-            result['trainers_ahead'] = section.trainers
-            result['items_available'] = section.items
-            result['pokemon_available'] = section.available_pokemon
-
-            # Get map image
-            map_data = None
-            if milestone_id:
-                map_data = self.map_provider.get_map_for_milestone(milestone_id)
-            if not map_data and location:
-                map_data = self.map_provider.get_map_for_location(location)
-
-            if map_data and map_data.image:
-                result['map_image'] = map_data.image
-                logger.debug(f"Loaded map: {map_data.location_name} ({map_data.image.size[0]}x{map_data.image.size[1]})")
-
             # Format guidance text
-            result['formatted_guidance'] = self._format_section_guidance(
+            guidance = self._format_section_guidance(
                 section,
                 context,
                 include_full_details=True
             )
 
-            logger.info(f"Retrieved contextual knowledge for {section.title}")
+            logger.debug("Retrieved contextual knowledge for %s", section.title)
 
         except Exception as e:
             logger.error(f"Error getting contextual knowledge: {e}", exc_info=True)
-
+            # Don't memoize partial results from a failed lookup
+            if section is None:
+                return ContextualKnowledge()
+            return ContextualKnowledge.for_section(section)
+
+        cached = ContextualKnowledge.for_section(section, formatted_guidance=guidance)
+        self._ctx_cache[key] = cached
+        result = self._with_map_image(cached, milestone_id, location, need_map)
+        self._last_ctx_key, self._last_ctx_result = last_key, result
         return result
 
+    def _with_map_image(
+        self,
+        knowledge: ContextualKnowledge,
+        milestone_id: str,
+        location: str,
+        need_map: bool
+    ) -> ContextualKnowledge:
+        """
+        Attach the current map image to image-free cached knowledge.
+
+        Args:
+            knowledge: Cached ContextualKnowledge without a map image
+            milestone_id: Current milestone
+            location: Current location
+            need_map: If False, skip the map lookup (text-only callers)
+
+        Returns:
+            knowledge itself, or a copy carrying the map image
+        """
+        if not need_map or knowledge.current_section is None:
+            return knowledge
+
+        try:
+            map_data = self._lookup_map(milestone_id, location)
+        except Exception as e:
+            logger.error(f"Error getting map for contextual knowledge: {e}", exc_info=True)
+            return knowledge
+        if not map_data or not map_data.image:
+            return knowledge
+
+        map_image = map_data.image
+        if logger.isEnabledFor(logging.DEBUG):
+            width, height = map_image.size
+            logger.debug("Loaded map: %s (%dx%d)", map_data.location_name, width, height)
+        return dataclasses.replace(knowledge, map_image=map_image)
+
     def format_knowledge_for_prompt(
         self,
         milestone_id: str,
@@ -161,12 +280,44 @@ class KnowledgeManager:
             Formatted string ready for VLM prompt
         """
         # Get contextual knowledge
-        knowledge = self.get_contextual_knowledge(milestone_id, location, context)
+        knowledge = self.get_contextual_knowledge(milestone_id, location, context, need_map=False)
 
-        if not knowledge['current_section']:
+        if not knowledge.current_section:
             return ""
 
-        return knowledge['formatted_guidance']
+        return knowledge.formatted_guidance
+
+    def format_knowledge_for_prompt_batch(
+        self,
+        queries: List[Tuple[str, str, str]],
+        include_full_details: bool = True
+    ) -> str:
+        """
+        Format knowledge for several game states as one numbered prompt block.
+
+        Lets a caller fold lookahead milestones into a single VLM request
+        instead of one request per step.
+
+        Args:
+            queries: List of (milestone_id, location, context) tuples
+            include_full_details: If False, uses the compact guidance
+
+        Returns:
+            One "--- QUERY n ---" block per query, in order; queries without
+            a matching section get an empty block so numbering stays aligned
+        """
+        parts = []
+        for i, (milestone_id, location, context) in enumerate(queries, 1):
+            knowledge = self.get_contextual_knowledge(milestone_id, location, context, need_map=False)
+            section = knowledge.current_section
+            if not section:
+                guidance = ""
+            elif include_full_details:
+                guidance = knowledge.formatted_guidance
+            else:
+                guidance = self._format_section_guidance(section, context, include_full_details=False)
+            parts.append(f"--- QUERY {i} ---\n{guidance}")
+        return "\n".join(parts)
 
     def _format_section_guidance(
         self,
@@ -175,7 +326,7 @@ class KnowledgeManager:
         include_full_details: bool = True
     ) -> str:
         """
-        Format a knowledge section into readable guidance text.
+        Get the pre-rendered guidance text for a knowledge section.
 
         Args:
             section: KnowledgeSection to format
@@ -185,105 +336,142 @@ class KnowledgeManager:
         Returns:
             Formatted guidance string
         """
-        lines = []
-
-        # Header
-        lines.append(f"📚 SPEEDRUN KNOWLEDGE - {section.title.upper()}:")
-        lines.append("")
-
-        # Location and description
-        lines.append(f"LOCATION: {section.title}")
-        if section.description:
-            lines.append(f"DESCRIPTION: {section.description}")
-        lines.append("")
-
-        # Objectives (key goals)
-        if section.objectives:
-            lines.append("KEY OBJECTIVES:")
-            for obj in section.objectives[:5]:  # Top 5 objectives
-                lines.append(f"  • {obj}")
-            lines.append("")
-
-        # Battle context - show trainers
-        if section.trainers and (context == "battle" or context == "overworld"):
-            lines.append("TRAINERS/BATTLES:")
-            for trainer in section.trainers[:5]:  # Limit to top 5
-                lines.append(f"  • {trainer.name} ({trainer.trainer_class})")
-                if trainer.pokemon:
-                    pokemon_summary = ", ".join([
-                        f"{p['species']} (Lv {p['level']})"
-                        for p in trainer.pokemon[:3]  # Show up to 3 Pokemon
-                    ])
-                    lines.append(f"    Team: {pokemon_summary}")
-                if trainer.prize_money:
-                    lines.append(f"    Prize: ${trainer.prize_money}")
-            lines.append("")
-
-        # Items available
-        if section.items and include_full_details:
-            lines.append("ITEMS AVAILABLE:")
-            for item in section.items[:8]:  # Top 8 items
-                hidden_marker = " (hidden)" if item.is_hidden else ""
-                hm_marker = f" [requires {item.requires_hm}]" if item.requires_hm else ""
-                lines.append(f"  • {item.name}{hidden_marker}{hm_marker}")
-                if len(item.location_detail) < 80:  # Don't show super long details
-                    lines.append(f"    Location: {item.location_detail}")
-            lines.append("")
-
-        # Wild Pokemon encounters
-        if section.available_pokemon and include_full_details:
-            lines.append("WILD POKEMON:")
-            for pokemon in section.available_pokemon[:6]:  # Top 6 species
-                lines.append(f"  • {pokemon.species} (Lv {pokemon.level_range}, {pokemon.encounter_rate})")
-            lines.append("")
+        key = (section.section_id, context, include_full_details)
+        guidance = self._guidance.get(key)
+        if guidance is None:
+            guidance = self._format_section_guidance_impl(section, context, include_full_details)
+            self._guidance[key] = guidance
+        return guidance
+
+    def _format_section_guidance_impl(
+        self,
+        section: KnowledgeSection,
+        context: str,
+        include_full_details: bool = True
+    ) -> str:
+        """
+        Format a knowledge section into readable guidance text.
 
-        # Strategic tips
-        if section.tips:
-            lines.append("💡 SPEEDRUN TIPS:")
-            for tip in section.tips[:5]:  # Top 5 tips
-                # Clean up tip formatting
-                tip_clean = tip.strip('*-• ').strip()
-                if len(tip_clean) > 0 and len(tip_clean) < 200:
-                    lines.append(f"  • {tip_clean}")
-            lines.append("")
+        Args:
+            section: KnowledgeSection to format
+            context: Game context
+            include_full_details: Include all details vs compact
 
-        # Subsections (like "Gym Leader Roxanne", "Birch's Lab")
-        if include_full_details and section.subsections:
-            important_subsections = [
-                key for key in section.subsections.keys()
-                if any(keyword in key for keyword in ["Gym Leader", "Lab", "Battle", "Meet"])
-            ]
-            if important_subsections:
-                lines.append("IMPORTANT LOCATIONS/EVENTS:")
-                for subsection_name in important_subsections[:3]:  # Top 3 subsections
-                    lines.append(f"  • {subsection_name}")
-                lines.append("")
+        Returns:
+            Formatted guidance string
+        """
+        header = (f"{GUIDANCE_HEADER_PREFIX}{section.title.upper()}:", "")
 
         # Compact mode - just essentials
         if not include_full_details:
-            # Keep only: description, objectives, trainers (if any), tips
-            compact_lines = [lines[0], lines[1]]  # Header
-
-            if section.description:
-                compact_lines.append(f"DESCRIPTION: {section.description}")
-                compact_lines.append("")
-
-            if section.objectives:
-                compact_lines.append("OBJECTIVES:")
-                compact_lines.extend([f"  • {obj}" for obj in section.objectives[:3]])
-                compact_lines.append("")
+            return "\n".join(itertools.chain(header, self._compact_block(section)))
+
+        return "\n".join(itertools.chain(
+            header,
+            self._location_block(section),
+            self._objectives_block(section),
+            self._trainers_block(section, context),
+            self._items_block(section),
+            self._wild_pokemon_block(section),
+            self._tips_block(section),
+            self._subsections_block(section),
+        ))
+
+    @staticmethod
+    def _location_block(section: KnowledgeSection) -> List[str]:
+        """Location and description lines"""
+        if section.description:
+            return [f"LOCATION: {section.title}", f"DESCRIPTION: {section.description}", ""]
+        return [f"LOCATION: {section.title}", ""]
 
-            if section.trainers:
-                compact_lines.append(f"TRAINERS: {len(section.trainers)} battles ahead")
-                compact_lines.append("")
+    @staticmethod
+    def _objectives_block(section: KnowledgeSection) -> List[str]:
+        """Key objectives (top 5)"""
+        if not section.objectives:
+            return []
+        return ["KEY OBJECTIVES:", *(f"  • {obj}" for obj in section.objectives[:5]), ""]
 
-            if section.tips:
-                compact_lines.append("TIPS:")
-                compact_lines.extend([f"  • {tip.strip()}" for tip in section.tips[:2]])
+    @staticmethod
+    def _trainers_block(section: KnowledgeSection, context: str) -> List[str]:
+        """Trainer battles (top 5), only shown in battle/overworld contexts"""
+        if not section.trainers or context not in TRAINER_CONTEXTS:
+            return []
+        lines = ["TRAINERS/BATTLES:"]
+        for trainer in section._top_trainers:
+            lines.append(f"  • {trainer.name} ({trainer.trainer_class})")
+            if trainer.pokemon:
+                pokemon_summary = ", ".join(
+                    f"{p['species']} (Lv {p['level']})"
+                    for p in trainer.pokemon[:3]  # Show up to 3 Pokemon
+                )
+                lines.append(f"    Team: {pokemon_summary}")
+            if trainer.prize_money:
+                lines.append(f"    Prize: ${trainer.prize_money}")
+        lines.append("")
+        return lines
 
-            return "\n".join(compact_lines)
+    @staticmethod
+    def _items_block(section: KnowledgeSection) -> List[str]:
+        """Available items (top 8)"""
+        if not section.items:
+            return []
+        lines = ["ITEMS AVAILABLE:"]
+        for item in section._top_items:
+            hidden_marker = " (hidden)" if item.is_hidden else ""
+            hm_marker = f" [requires {item.requires_hm}]" if item.requires_hm else ""
+            lines.append(f"  • {item.name}{hidden_marker}{hm_marker}")
+            if item._display_location is not None:  # Super long details are hidden
+                lines.append(f"    Location: {item._display_location}")
+        lines.append("")
+        return lines
 
-        return "\n".join(lines)
+    @staticmethod
+    def _wild_pokemon_block(section: KnowledgeSection) -> List[str]:
+        """Wild Pokemon encounters (top 6 species)"""
+        if not section.available_pokemon:
+            return []
+        return [
+            "WILD POKEMON:",
+            *(f"  • {pokemon.species} (Lv {pokemon.level_range}, {pokemon.encounter_rate})"
+              for pokemon in section._top_pokemon),
+            "",
+        ]
+
+    @staticmethod
+    def _tips_block(section: KnowledgeSection) -> List[str]:
+        """Strategic tips (top 5), skipping empty or overly long ones"""
+        if not section.tips:
+            return []
+        return ["💡 SPEEDRUN TIPS:", *(f"  • {tip}" for tip in section._renderable_tips), ""]
+
+    @staticmethod
+    def _subsections_block(section: KnowledgeSection) -> List[str]:
+        """Important subsections (like "Gym Leader Roxanne", "Birch's Lab"), top 3"""
+        # Stop scanning once the first 3 matches are found
+        important_subsections = list(itertools.islice(
+            filter(IMPORTANT_SUBSECTION_RE.search, section.subsections), 3
+        ))
+        if not important_subsections:
+            return []
+        return [
+            "IMPORTANT LOCATIONS/EVENTS:",
+            *(f"  • {name}" for name in important_subsections),
+            "",
+        ]
+
+    @staticmethod
+    def _compact_block(section: KnowledgeSection) -> List[str]:
+        """Compact guidance body: description, objectives, trainer count, tips"""
+        lines = []
+        if section.description:
+            lines += [f"DESCRIPTION: {section.description}", ""]
+        if section.objectives:
+            lines += ["OBJECTIVES:", *(f"  • {obj}" for obj in section.objectives[:3]), ""]
+        if section.trainers:
+            lines += [f"TRAINERS: {len(section.trainers)} battles ahead", ""]
+        if section.tips:
+            lines += ["TIPS:", *(f"  • {tip.strip()}" for tip in section.tips[:2])]
+        return lines
 
     def get_map_image(
         self,
@@ -303,22 +491,27 @@ class KnowledgeManager:
             PIL Image or None
         """
         try:
-            # Try milestone first
-            map_data = None
-            if milestone_id:
-                map_data = self.map_provider.get_map_for_milestone(milestone_id)
+            if max_size:
+                resized_key = (milestone_id, location, max_size)
+                resized = self._resized_cache.get(resized_key)
+                if resized is not None:
+                    self._resized_cache.move_to_end(resized_key)
+                    return resized
 
-            # Fallback to location
-            if not map_data and location:
-                map_data = self.map_provider.get_map_for_location(location)
+            map_data = self._lookup_map(milestone_id, location)
 
             if not map_data or not map_data.image:
-                logger.debug(f"No map image available for milestone={milestone_id}, location={location}")
+                logger.debug("No map image available for milestone=%s, location=%s", milestone_id, location)
                 return None
 
-            # Resize if requested
+            # Resize if requested (PIL allocates a new buffer each time, so keep the thumbnail)
             if max_size:
-                return self.map_provider.resize_map(map_data, max_size)
+                resized = self.map_provider.resize_map(map_data, max_size)
+                if resized is not None:
+                    self._resized_cache[resized_key] = resized
+                    if len(self._resized_cache) > self.RESIZED_CACHE_SIZE:
+                        self._resized_cache.popitem(last=False)
+                return resized
 
             return map_data.image
 
@@ -326,6 +519,37 @@ class KnowledgeManager:
             logger.error(f"Error getting map image: {e}", exc_info=True)
             return None
 
+    def _lookup_map(self, milestone_id: str, location: str) -> Optional[MapData]:
+        """
+        Find the map for a milestone (falling back to location), memoized.
+
+        Args:
+            milestone_id: Current milestone
+            location: Current location
+
+        Returns:
+            MapData or None
+        """
+        key = (milestone_id, location)
+        map_data = self._map_data_cache.get(key)
+        # Re-resolve if the provider dropped the image behind our back
+        if map_data is not None and map_data.image is not None:
+            return map_data
+        if map_data is None and key in self._map_data_cache:
+            return None
+
+        # Try milestone first
+        map_data = None
+        if milestone_id:
+            map_data = self.map_provider.get_map_for_milestone(milestone_id)
+
+        # Fallback to location
+        if not map_data and location:
+            map_data = self.map_provider.get_map_for_location(location)
+
+        self._map_data_cache[key] = map_data
+        return map_data
+
     def get_battle_strategy(
         self,
         milestone_id: str,
@@ -343,25 +567,25 @@ class KnowledgeManager:
         Returns:
             Battle strategy text
         """
-        knowledge = self.get_contextual_knowledge(milestone_id, location, context="battle")
+        knowledge = self.get_contextual_knowledge(milestone_id, location, context="battle", need_map=False)
 
-        if not knowledge['current_section']:
+        if not knowledge.current_section:
             return ""
 
         lines = []
-        lines.append("⚔️  BATTLE STRATEGY:")
+        lines.append(BATTLE_STRATEGY_HEADER)
         lines.append("")
 
         # Find relevant trainer
         target_trainer = None
         if trainer_name:
-            for trainer in knowledge['trainers_ahead']:
+            for trainer in knowledge.trainers_ahead:
                 if trainer_name.lower() in trainer.name.lower():
                     target_trainer = trainer
                     break
-        elif knowledge['trainers_ahead']:
+        elif knowledge.trainers_ahead:
             # Use first trainer (likely the gym leader or key battle)
-            target_trainer = knowledge['trainers_ahead'][0]
+            target_trainer = knowledge.trainers_ahead[0]
 
         if target_trainer:
             lines.append(f"OPPONENT: {target_trainer.name} ({target_trainer.trainer_class})")
@@ -380,12 +604,10 @@ class KnowledgeManager:
 
             lines.append("")
 
-            # Add relevant tips
-            if knowledge['tips']:
+            # Add relevant tips (filtered once when the section was built)
+            if knowledge.tips:
                 lines.append("STRATEGY TIPS:")
-                for tip in knowledge['tips']:
-                    if any(keyword in tip.lower() for keyword in ['battle', 'use', 'effective', 'weak', 'strong']):
-                        lines.append(f"  • {tip.strip()}")
+                lines.extend(f"  • {tip}" for tip in knowledge.current_section._battle_tips)
 
         return "\n".join(lines)
 
@@ -404,12 +626,12 @@ class KnowledgeManager:
         Returns:
             List of next step strings
         """
-        knowledge = self.get_contextual_knowledge(milestone_id, location)
+        knowledge = self.get_contextual_knowledge(milestone_id, location, need_map=False)
 
-        if not knowledge['current_section']:
+        if not knowledge.current_section:
             return []
 
-        section = knowledge['current_section']
+        section = knowledge.current_section
 
         # Return objectives as next steps
         return section.objectives[:5]  # Top 5 next steps
@@ -431,49 +653,53 @@ class KnowledgeManager:
         Returns:
             List of item descriptions
         """
-        knowledge = self.get_contextual_knowledge(milestone_id, location)
-
-        items = []
-        for item in knowledge['items_available']:
-            if exclude_hidden and item.is_hidden:
-                continue
-
-            items.append(f"{item.name} - {item.location_detail}")
+        knowledge = self.get_contextual_knowledge(milestone_id, location, need_map=False)
+        section = knowledge.current_section
+        if not section:
+            return []
 
-        return items
+        # Descriptions are formatted once per section; hand out a copy
+        return list(section._items_visible_strs if exclude_hidden else section._items_full_strs)
 
-    def get_available_sections(self) -> Dict[str, KnowledgeSection]:
-        """Get all available knowledge sections"""
-        return self.sections.copy()
+    def get_available_sections(self) -> Mapping[str, KnowledgeSection]:
+        """Get all available knowledge sections (read-only view, no copy)"""
+        return self._sections_ro
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the knowledge base"""
         map_stats = self.map_provider.get_cache_stats()
 
-        total_trainers = sum(len(s.trainers) for s in self.sections.values())
-        total_items = sum(len(s.items) for s in self.sections.values())
-        total_pokemon = sum(len(s.available_pokemon) for s in self.sections.values())
-        total_tips = sum(len(s.tips) for s in self.sections.values())
-
         return {
             'knowledge_sections': len(self.sections),
             'total_maps': map_stats['total_maps'],
             'location_mappings': map_stats['location_mappings'],
-            'total_trainers': total_trainers,
-            'total_items': total_items,
-            'total_pokemon': total_pokemon,
-            'total_tips': total_tips,
+            **self._section_totals,
+        }
+
+    def _compute_section_totals(self) -> Dict[str, int]:
+        """Sum trainers/items/Pokemon/tips across all sections"""
+        sections = self.sections.values()
+        return {
+            'total_trainers': sum(len(s.trainers) for s in sections),
+            'total_items': sum(len(s.items) for s in sections),
+            'total_pokemon': sum(len(s.available_pokemon) for s in sections),
+            'total_tips': sum(len(s.tips) for s in sections),
         }
 
     def preload_resources(self):
         """Preload all maps for better performance"""
         logger.info("Preloading all knowledge resources...")
-        self.map_provider.preload_all_maps()
+        self.map_provider.preload_all_maps(max_workers=min(MAX_PRELOAD_WORKERS, os.cpu_count() or 1))
         logger.info("Resources preloaded successfully")
 
     def clear_cache(self):
         """Clear cached resources to free memory"""
         self.map_provider.clear_cache()
+        self._ctx_cache.clear()
+        self._last_ctx_key = None
+        self._last_ctx_result = None
+        self._map_data_cache.clear()
+        self._resized_cache.clear()
         logger.info("Knowledge cache cleared")
 
     def __repr__(self):
@@ -7,16 +7,156 @@ Each section represents a location or milestone with detailed information.
 Part of the Knowledge Base Implementation Plan - Phase 1
 """
 
+import hashlib
+import itertools
 import logging
+import os
+import pickle
 import re
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _parser_fingerprint() -> Optional[str]:
+    """SHA-1 of this module's source, or None if it can't be read"""
+    try:
+        return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+# Parse caches are keyed on the parser source as well as the markdown content,
+# so any change to the parser or the section dataclasses invalidates them
+PARSER_FINGERPRINT = _parser_fingerprint()
+
+# Keywords marking a tip as relevant to battle strategy
+BATTLE_TIP_KEYWORDS = ("battle", "use", "effective", "weak", "strong")
+
+# Substrings (matched against the lowercased line) that mark a tip
+TIP_INDICATORS = (
+    'tip:', 'note:', 'important:', 'remember:', 'warning:',
+    'recommended', 'optimal', 'should', 'must', 'avoid',
+    'best choice', 'strategy', 'use', 'super effective',
+    'weak', 'strong against', 'advise', 'suggest'
+)
+
+# Verbs that mark a subsection header or sentence as an objective
+OBJECTIVE_VERBS = (
+    'Meet', 'Visit', 'Travel', 'Defeat', 'Obtain', 'Catch',
+    'Battle', 'Challenge', 'Receive', 'Get', 'Find', 'Enter',
+    'Go', 'Head', 'Navigate', 'Explore', 'Save', 'Help',
+    'Return', 'Arrive'
+)
+
+# Mapping of section titles to game location IDs
+LOCATION_MAPPING: Mapping[str, str] = MappingProxyType({
+    "Introduction": "INTRO",
+    "Home": "MOVING_VAN",
+    "Littleroot Town": "LITTLEROOT_TOWN",
+    "Route 101": "ROUTE101",
+    "Oldale Town": "OLDALE_TOWN",
+    "Route 103": "ROUTE103",
+    "Route 102": "ROUTE102",
+    "Petalburg City": "PETALBURG_CITY",
+    "Petalburg City (first visit)": "PETALBURG_CITY",
+    "Route 104": "ROUTE104",
+    "Route 104 (south)": "ROUTE104",
+    "Route 104 (north)": "ROUTE104",
+    "Petalburg Woods": "PETALBURG_WOODS",
+    "Rustboro City": "RUSTBORO_CITY",
+    "Rustboro Gym": "RUSTBORO_CITY_GYM",
+})
+
+# Important subsections to promote to full sections (gyms, labs, etc.)
+IMPORTANT_SUBSECTIONS = frozenset({
+    "Rustboro Gym",
+    "Professor Birch's House",
+    "Birch's Lab",
+    "Pretty Petal Flower Shop",
+    "Petalburg Gym",
+})
+
+# Milestone IDs associated with each location ID
+MILESTONE_MAPPING: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "INTRO": ("GAME_RUNNING", "INTRO_CUTSCENE_COMPLETE"),
+    "MOVING_VAN": ("INTRO_CUTSCENE_COMPLETE", "PLAYER_HOUSE_ENTERED"),
+    "LITTLEROOT_TOWN": ("PLAYER_HOUSE_ENTERED", "PLAYER_BEDROOM", "CLOCK_SET",
+                       "RIVAL_HOUSE", "RIVAL_BEDROOM", "BIRCH_LAB_VISITED", "RECEIVED_POKEDEX"),
+    "ROUTE101": ("ROUTE_101", "STARTER_CHOSEN"),
+    "OLDALE_TOWN": ("OLDALE_TOWN",),
+    "ROUTE103": ("ROUTE_103",),
+    "ROUTE102": ("ROUTE_102",),
+    "PETALBURG_CITY": ("PETALBURG_CITY", "DAD_FIRST_MEETING", "GYM_EXPLANATION"),
+    "ROUTE104": ("ROUTE_104_SOUTH", "ROUTE_104_NORTH"),
+    "PETALBURG_WOODS": ("PETALBURG_WOODS", "TEAM_AQUA_GRUNT_DEFEATED"),
+    "RUSTBORO_CITY": ("RUSTBORO_CITY",),
+    "RUSTBORO_CITY_GYM": ("RUSTBORO_GYM_ENTERED", "ROXANNE_DEFEATED", "FIRST_GYM_COMPLETE"),
+})
+
+# Cap on objectives kept per section
+MAX_OBJECTIVES = 8
+
+# Line kinds assigned by KnowledgeParser._classify_lines, from the first
+# character of the stripped line
+_LINE_BLANK = 0
+_LINE_HEADER = 1
+_LINE_LIST = 2
+_LINE_TEXT = 3
+_LINE_KIND_BY_FIRST_CHAR = {'#': _LINE_HEADER, '-': _LINE_LIST, '*': _LINE_LIST}
+
+# (kind, raw line, stripped line, lowercased stripped line)
+_ClassifiedLine = Tuple[int, str, str, str]
+
+# Top-level (# Title) and subsection (## Title) header lines
+_H1_RE = re.compile(r'^# (.*)$', re.MULTILINE)
+_H2_RE = re.compile(r'^## (.*)$', re.MULTILINE)
+
+# Trainer patterns. The first four are run over a whole section with
+# finditer, so whitespace/negated classes exclude '\n' ([^\S\n] is \s minus
+# newline) to keep every match on a single line, exactly as a per-line
+# search would see it
+_GYM_LEADER_RE = re.compile(r'###[^\S\n]*Gym[^\S\n]*Leader[^\S\n]+(\w+)', re.IGNORECASE)
+_GYM_PRIZE_RE = re.compile(r'Prize:[^\S\n]*(\d+)[^\S\n]*Pokédollars')
+_GYM_POKEMON_RE = re.compile(
+    r'^[^\S\n]*-[^\S\n]*\*\*([A-Za-z]+)\*\*[^\S\n]*\(([^)\n]+)\)[^,\n]*,[^\S\n]*Level[^\S\n]*(\d+)',
+    re.MULTILINE
+)
+_TRAINER_INLINE_RE = re.compile(r'\*\*([^*\n]+)\*\*[^\S\n]*-[^\S\n]*(.+)')
+_TRAINER_CLASS_RE = re.compile(r'\(([^)]+)\)')
+_PAREN_CLASS_RE = re.compile(r'\s*\([^)]+\)')
+_LEVEL_RE = re.compile(r'Level?\s*(\d+)', re.IGNORECASE)
+# Species name: everything before the first ',', '(' or 'Level'
+_SPECIES_RE = re.compile(r'(.*?)(?:level|[,(]|$)', re.IGNORECASE)
+_STRIP_GENDER = str.maketrans('', '', '♂♀')
+_PRIZE_RE = re.compile(r'(\d+)\s*Pokédollars')
+
+# Wild Pokemon patterns
+_AVAILABLE_POKEMON_SECTION_RE = re.compile(
+    r'##\s*Available\s*Pok[eé]mon\s*\n(.*?)(?=\n##|\Z)',
+    re.DOTALL | re.IGNORECASE
+)
+_POKE_LINE_RE = re.compile(r'[-*]\s*\*?\*?([A-Za-z\s]+?)\*?\*?\s*[-–]\s*Level\s*([\d-]+)\s*\(([^)]+)\)')
+
+# Item patterns
+# Also matches '### Items' headers (at the second '#')
+_ITEMS_SECTION_RE = re.compile(r'##\s*Items\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+_ITEM_LINE_RE = re.compile(r'[-*]\s*\*?\*?([^*\n-]+?)\*?\*?\s*[-–]\s*(.+)')
+_HM_RE = re.compile(r'\b(Cut|Surf|Strength|Rock Smash|Fly|Waterfall|Dive)\b')
+
+# Keyword alternations, so each line is checked in a single scan. Case-
+# sensitive on purpose: tips and objective sentences are matched against
+# str.lower()'d lines, subsection headers against the verbs as written
+_TIP_INDICATOR_RE = re.compile('|'.join(map(re.escape, TIP_INDICATORS)))
+_OBJECTIVE_HEADER_RE = re.compile('|'.join(map(re.escape, OBJECTIVE_VERBS)))
+_OBJECTIVE_SENTENCE_RE = re.compile('|'.join(re.escape(verb.lower()) for verb in OBJECTIVE_VERBS))
+
+
+@dataclass(frozen=True, slots=True)
 class TrainerInfo:
     """Information about a trainer battle"""
     name: str
@@ -26,7 +166,7 @@ class TrainerInfo:
     notes: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PokemonEncounter:
     """Wild Pokemon encounter information"""
     species: str
@@ -35,16 +175,22 @@ class PokemonEncounter:
     location_detail: Optional[str] = None  # "in tall grass", "surfing", etc.
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ItemInfo:
     """Information about an item"""
     name: str
     location_detail: str
     is_hidden: bool = False
     requires_hm: Optional[str] = None  # "Cut", "Surf", etc.
+    # location_detail when short enough to show in guidance, else None
+    _display_location: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        display_location = self.location_detail if len(self.location_detail) < 80 else None
+        object.__setattr__(self, '_display_location', display_location)
 
-@dataclass
+
+@dataclass(slots=True)
 class KnowledgeSection:
     """A section of speedrun knowledge representing a location or milestone"""
     section_id: str              # "littleroot_town", "route_101", etc.
@@ -54,14 +200,46 @@ class KnowledgeSection:
     description: str = ""        # Brief description of the location
     objectives: List[str] = field(default_factory=list)  # Key objectives
     trainers: List[TrainerInfo] = field(default_factory=list)  # Trainer battles
-    available_pokemon: List[PokemonEncounter] = field(default_factory=list)  # Wild Pokemon
-    items: List[ItemInfo] = field(default_factory=list)  # Items available
+    available_pokemon: Tuple[PokemonEncounter, ...] = ()  # Wild Pokemon (read-only)
+    items: Tuple[ItemInfo, ...] = ()  # Items available (read-only)
     tips: List[str] = field(default_factory=list)  # Strategic tips/notes
     prerequisites: List[str] = field(default_factory=list)  # Previous sections needed
     next_sections: List[str] = field(default_factory=list)  # Possible next sections
     milestone_ids: List[str] = field(default_factory=list)  # Related milestone IDs
     subsections: Dict[str, str] = field(default_factory=dict)  # Subsections by header
 
+    # Pre-sliced views used by guidance formatting (filled in __post_init__)
+    _top_trainers: List[TrainerInfo] = field(default_factory=list, init=False, repr=False, compare=False)
+    _top_items: Tuple[ItemInfo, ...] = field(default=(), init=False, repr=False, compare=False)
+    _top_pokemon: Tuple[PokemonEncounter, ...] = field(default=(), init=False, repr=False, compare=False)
+    _renderable_tips: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _battle_tips: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _items_full_strs: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _items_visible_strs: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.available_pokemon = tuple(self.available_pokemon)
+        self.items = tuple(self.items)
+        self._top_trainers = self.trainers[:5]
+        self._top_items = self.items[:8]
+        self._top_pokemon = self.available_pokemon[:6]
+        # Of the top 5 tips, the cleaned ones that are non-empty and under 200 chars
+        self._renderable_tips = []
+        for tip in self.tips[:5]:
+            tip_clean = tip.strip('*-• ').strip()
+            if 0 < len(tip_clean) < 200:
+                self._renderable_tips.append(tip_clean)
+        self._battle_tips = []
+        for tip in self.tips:
+            tip_lower = tip.lower()
+            if any(keyword in tip_lower for keyword in BATTLE_TIP_KEYWORDS):
+                self._battle_tips.append(tip.strip())
+        self._items_full_strs = [f"{item.name} - {item.location_detail}" for item in self.items]
+        self._items_visible_strs = [
+            item_str for item_str, item in zip(self._items_full_strs, self.items, strict=True)
+            if not item.is_hidden
+        ]
+
 
 class KnowledgeParser:
     """
@@ -71,61 +249,30 @@ class KnowledgeParser:
     extracted trainers, items, Pokemon, tips, and objectives.
     """
 
-    def __init__(self, knowledge_file: str = "data/knowledge/speedrun.md"):
+    def __init__(self, knowledge_file: str = "data/knowledge/speedrun.md", use_cache: bool = False):
         """
         Initialize the knowledge parser.
 
         Args:
             knowledge_file: Path to speedrun.md file
+            use_cache: Reuse/write a pickled parse next to the markdown file
+                (speedrun.md.pkl), keyed on the file's content hash and the
+                parser source
         """
         self.knowledge_file = Path(knowledge_file)
+        self.use_cache = use_cache and PARSER_FINGERPRINT is not None
+        self.cache_file = self.knowledge_file.with_suffix(self.knowledge_file.suffix + '.pkl')
         self.sections: Dict[str, KnowledgeSection] = {}
         self.raw_content: str = ""
 
-        # Mapping of section titles to game location IDs
-        self.location_mapping = {
-            "Introduction": "INTRO",
-            "Home": "MOVING_VAN",
-            "Littleroot Town": "LITTLEROOT_TOWN",
-            "Route 101": "ROUTE101",
-            "Oldale Town": "OLDALE_TOWN",
-            "Route 103": "ROUTE103",
-            "Route 102": "ROUTE102",
-            "Petalburg City": "PETALBURG_CITY",
-            "Petalburg City (first visit)": "PETALBURG_CITY",
-            "Route 104": "ROUTE104",
-            "Route 104 (south)": "ROUTE104",
-            "Route 104 (north)": "ROUTE104",
-            "Petalburg Woods": "PETALBURG_WOODS",
-            "Rustboro City": "RUSTBORO_CITY",
-            "Rustboro Gym": "RUSTBORO_CITY_GYM",
-        }
+        # Reverse indices for the per-step lookups, rebuilt by parse_markdown
+        self._by_location: Dict[Optional[str], KnowledgeSection] = {}
+        self._by_milestone: Dict[str, KnowledgeSection] = {}
 
-        # Important subsections to promote to full sections (gyms, labs, etc.)
-        self.important_subsections = [
-            "Rustboro Gym",
-            "Professor Birch's House",
-            "Birch's Lab",
-            "Pretty Petal Flower Shop",
-            "Petalburg Gym"
-        ]
-
-        # Milestone mapping
-        self.milestone_mapping = {
-            "INTRO": ["GAME_RUNNING", "INTRO_CUTSCENE_COMPLETE"],
-            "MOVING_VAN": ["INTRO_CUTSCENE_COMPLETE", "PLAYER_HOUSE_ENTERED"],
-            "LITTLEROOT_TOWN": ["PLAYER_HOUSE_ENTERED", "PLAYER_BEDROOM", "CLOCK_SET",
-                               "RIVAL_HOUSE", "RIVAL_BEDROOM", "BIRCH_LAB_VISITED", "RECEIVED_POKEDEX"],
-            "ROUTE101": ["ROUTE_101", "STARTER_CHOSEN"],
-            "OLDALE_TOWN": ["OLDALE_TOWN"],
-            "ROUTE103": ["ROUTE_103"],
-            "ROUTE102": ["ROUTE_102"],
-            "PETALBURG_CITY": ["PETALBURG_CITY", "DAD_FIRST_MEETING", "GYM_EXPLANATION"],
-            "ROUTE104": ["ROUTE_104_SOUTH", "ROUTE_104_NORTH"],
-            "PETALBURG_WOODS": ["PETALBURG_WOODS", "TEAM_AQUA_GRUNT_DEFEATED"],
-            "RUSTBORO_CITY": ["RUSTBORO_CITY"],
-            "RUSTBORO_CITY_GYM": ["RUSTBORO_GYM_ENTERED", "ROXANNE_DEFEATED", "FIRST_GYM_COMPLETE"],
-        }
+        # Constant lookup tables, shared (read-only) across instances
+        self.location_mapping = LOCATION_MAPPING
+        self.important_subsections = IMPORTANT_SUBSECTIONS
+        self.milestone_mapping = MILESTONE_MAPPING
 
         logger.info(f"Initialized KnowledgeParser with file: {self.knowledge_file}")
 
@@ -140,25 +287,38 @@ class KnowledgeParser:
             logger.error(f"Knowledge file not found: {self.knowledge_file}")
             return {}
 
-        # Read entire file
-        with open(self.knowledge_file, 'r', encoding='utf-8') as f:
-            self.raw_content = f.read()
+        # Read the file once as bytes: hash them for the cache key, then
+        # decode with the same newline translation text mode would apply
+        with open(self.knowledge_file, 'rb') as f:
+            raw_bytes = f.read()
+        content_hash = hashlib.sha1(raw_bytes).hexdigest()
+        self.raw_content = raw_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        del raw_bytes
 
         logger.info(f"Read {len(self.raw_content)} characters from {self.knowledge_file}")
 
-        # Split into sections by top-level headers (# Header)
-        sections_raw = self._split_by_headers(self.raw_content)
+        # Reuse the previous parse if the markdown content hasn't changed
+        if self.use_cache:
+            cached_sections = self._load_cached_sections(content_hash)
+            if cached_sections is not None:
+                self.sections.update(cached_sections)
+                self._build_lookup_indices()
+                logger.info(f"Loaded {len(self.sections)} knowledge sections from cache {self.cache_file}")
+                return self.sections
+
+        # Split into sections by top-level headers (# Header), collecting each
+        # section's subsections (## Header) in the same pass
+        sections_raw = self._split_headers_nested(self.raw_content)
 
         logger.info(f"Found {len(sections_raw)} top-level sections")
 
         # Parse each section
-        for section_title, section_content in sections_raw.items():
-            section = self._parse_section(section_title, section_content)
+        for section_title, (section_content, subsections) in sections_raw.items():
+            section = self._parse_section(section_title, section_content, subsections=subsections)
             if section:
                 self.sections[section.section_id] = section
 
             # Also check for important subsections to promote
-            subsections = self._parse_subsections(section_content)
             for subsection_title, subsection_content in subsections.items():
                 if subsection_title in self.important_subsections:
                     # Create a full section from this subsection
@@ -169,43 +329,125 @@ class KnowledgeParser:
 
         # Build relationships between sections
         self._build_section_relationships()
+        self._build_lookup_indices()
 
         logger.info(f"Successfully parsed {len(self.sections)} knowledge sections")
+
+        if self.use_cache and self.sections:
+            self._save_cached_sections(content_hash)
+
         return self.sections
 
-    def _split_by_headers(self, content: str) -> Dict[str, str]:
+    def _build_lookup_indices(self):
+        """Index sections by location and milestone, keeping the first match like a linear scan would"""
+        self._by_location = {}
+        self._by_milestone = {}
+        for section in self.sections.values():
+            self._by_location.setdefault(section.location_id, section)
+            for milestone_id in section.milestone_ids:
+                self._by_milestone.setdefault(milestone_id, section)
+
+    def _load_cached_sections(self, content_hash: str) -> Optional[Dict[str, KnowledgeSection]]:
         """
-        Split markdown content by top-level headers (# Header).
+        Load pickled sections if the cache matches this content and parser source.
+
+        Args:
+            content_hash: SHA-1 of the markdown content
 
         Returns:
-            Dictionary mapping header title -> section content
-        """
-        sections = {}
-        current_title = None
-        current_content = []
-
-        for line in content.split('\n'):
-            # Check if this is a top-level header (# Header)
-            if line.startswith('# ') and not line.startswith('## '):
-                # Save previous section
-                if current_title:
-                    sections[current_title] = '\n'.join(current_content)
-
-                # Start new section
-                current_title = line[2:].strip()
-                current_content = []
-            else:
-                # Add to current section
-                if current_title:
-                    current_content.append(line)
+            Cached sections, or None if there is no usable cache
+        """
+        if not self.cache_file.exists():
+            return None
+
+        try:
+            with open(self.cache_file, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse cache {self.cache_file}: {e}")
+            return None
+
+        if (not isinstance(payload, dict)
+                or payload.get('parser') != PARSER_FINGERPRINT
+                or payload.get('content_hash') != content_hash):
+            logger.debug("Parse cache %s is stale", self.cache_file)
+            return None
+
+        return payload['sections']
+
+    def _save_cached_sections(self, content_hash: str):
+        """
+        Pickle the parsed sections next to the markdown file (best effort).
+
+        Args:
+            content_hash: SHA-1 of the markdown content
+        """
+        payload = {
+            'parser': PARSER_FINGERPRINT,
+            'content_hash': content_hash,
+            'sections': self.sections,
+        }
+        # Write to a temp file and rename so readers never see a partial cache
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.debug("Could not write parse cache %s: %s", self.cache_file, e)
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
 
-        # Save last section
-        if current_title:
-            sections[current_title] = '\n'.join(current_content)
+    def _split_headers_nested(self, content: str) -> Dict[str, Tuple[str, Dict[str, str]]]:
+        """
+        Split markdown content by top-level headers (# Header), along with
+        each section's subsections (## Header).
 
-        return sections
+        Returns:
+            Dictionary mapping header title -> (section content, subsections)
+        """
+        return {
+            title: (section_content, self._parse_subsections(section_content))
+            for title, section_content in self._split_at_headers(content, _H1_RE).items()
+        }
+
+    @staticmethod
+    def _split_at_headers(content: str, header_re: re.Pattern) -> Dict[str, str]:
+        """
+        Slice content into header title -> body using one finditer scan.
+
+        Text before the first header is dropped, and a header with an empty
+        title only ends the previous body.
+
+        Args:
+            content: Markdown text to split
+            header_re: MULTILINE pattern matching a whole header line, with
+                the title in group 1
 
-    def _parse_section(self, title: str, content: str, is_subsection: bool = False) -> Optional[KnowledgeSection]:
+        Returns:
+            Dictionary mapping header title -> text between it and the next header
+        """
+        blocks = {}
+        matches = list(header_re.finditer(content))
+        for i, match in enumerate(matches):
+            title = match.group(1).strip()
+            if not title:
+                continue
+            # Body runs from after the header's newline up to (not including)
+            # the newline in front of the next header
+            end = matches[i + 1].start() - 1 if i + 1 < len(matches) else len(content)
+            blocks[title] = content[match.end() + 1:end]
+        return blocks
+
+    def _parse_section(
+        self,
+        title: str,
+        content: str,
+        is_subsection: bool = False,
+        subsections: Optional[Dict[str, str]] = None
+    ) -> Optional[KnowledgeSection]:
         """
         Parse a single section into a KnowledgeSection object.
 
@@ -213,6 +455,7 @@ class KnowledgeParser:
             title: Section title (e.g., "Littleroot Town")
             content: Section markdown content
             is_subsection: True if this is a promoted subsection
+            subsections: Already-parsed subsections of content, if available
 
         Returns:
             KnowledgeSection or None if parsing fails
@@ -225,16 +468,21 @@ class KnowledgeParser:
             location_id = self.location_mapping.get(title, section_id.upper())
 
             # Get milestone IDs
-            milestone_ids = self.milestone_mapping.get(location_id, [])
+            milestone_ids = list(self.milestone_mapping.get(location_id, ()))
+
+            # Split and classify lines once; every line-based extractor
+            # below walks this same list
+            lines = self._classify_lines(content)
 
             # Extract description (first paragraph)
-            description = self._extract_description(content)
+            description = self._extract_description(content, lines)
 
-            # Parse subsections
-            subsections = self._parse_subsections(content)
+            # Parse subsections (unless the caller already split them out)
+            if subsections is None:
+                subsections = self._parse_subsections(content)
 
             # Extract trainers
-            trainers = self._extract_trainers(content)
+            trainers = self._extract_trainers(content, lines)
 
             # Extract Pokemon encounters
             pokemon = self._extract_pokemon(content)
@@ -243,8 +491,8 @@ class KnowledgeParser:
             items = self._extract_items(content)
 
             # Extract tips and objectives
-            tips = self._extract_tips(content)
-            objectives = self._extract_objectives(content, title)
+            tips = self._extract_tips(content, lines)
+            objectives = self._extract_objectives(content, title, subsections, lines)
 
             section = KnowledgeSection(
                 section_id=section_id,
@@ -272,59 +520,80 @@ class KnowledgeParser:
 
     def _parse_subsections(self, content: str) -> Dict[str, str]:
         """Parse subsections (## Header) within a section"""
-        subsections = {}
-        current_header = None
-        current_content = []
-
-        for line in content.split('\n'):
-            if line.startswith('## '):
-                # Save previous subsection
-                if current_header:
-                    subsections[current_header] = '\n'.join(current_content).strip()
-
-                # Start new subsection
-                current_header = line[3:].strip()
-                current_content = []
-            else:
-                if current_header:
-                    current_content.append(line)
+        return {
+            header: body.strip()
+            for header, body in self._split_at_headers(content, _H2_RE).items()
+        }
 
-        # Save last subsection
-        if current_header:
-            subsections[current_header] = '\n'.join(current_content).strip()
+    @staticmethod
+    def _classify_lines(content: str) -> List[_ClassifiedLine]:
+        """
+        Split content into lines and tag each one once for the extractors.
 
-        return subsections
+        Returns:
+            List of (kind, raw line, stripped line, lowercased stripped line)
+            tuples, where kind is one of _LINE_BLANK/_LINE_HEADER/_LINE_LIST/_LINE_TEXT
+        """
+        kind_by_first_char = _LINE_KIND_BY_FIRST_CHAR
+        classified = []
+        for raw in content.split('\n'):
+            stripped = raw.strip()
+            if stripped:
+                kind = kind_by_first_char.get(stripped[0], _LINE_TEXT)
+            else:
+                kind = _LINE_BLANK
+            classified.append((kind, raw, stripped, stripped.lower()))
+        return classified
 
-    def _extract_description(self, content: str) -> str:
+    def _extract_description(self, content: str, lines: Optional[List[_ClassifiedLine]] = None) -> str:
         """Extract the first paragraph as description"""
-        lines = [l.strip() for l in content.split('\n') if l.strip()]
+        if lines is None:
+            lines = self._classify_lines(content)
 
-        # Find first non-header line
-        for line in lines:
-            if not line.startswith('#') and not line.startswith('-') and not line.startswith('*'):
-                # Return first substantial paragraph (at least 20 chars)
-                if len(line) >= 20:
-                    return line
+        # Find first non-header, non-list line
+        for kind, _, line, _ in lines:
+            # Return first substantial paragraph (at least 20 chars)
+            if kind == _LINE_TEXT and len(line) >= 20:
+                return line
 
         return ""
 
-    def _extract_trainers(self, content: str) -> List[TrainerInfo]:
+    def _extract_trainers(self, content: str, lines: Optional[List[_ClassifiedLine]] = None) -> List[TrainerInfo]:
         """
         Extract trainer battle information.
 
         Handles two formats:
         1. Inline: "- **Youngster Calvin** - Poochyena ♂, Level 5"
         2. Gym Leader: "### Gym Leader Roxanne" followed by Pokemon list
+
+        Each trainer pattern is run once over the whole content with
+        finditer; matches are mapped back to line numbers, keeping the first
+        match per line just like a per-line search would.
         """
         trainers = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = self._classify_lines(content)
+
+        # Offsets of each line start, for mapping match positions to lines
+        line_starts = list(itertools.accumulate((len(raw) + 1 for _, raw, _, _ in lines[:-1]), initial=0))
+
+        def first_match_per_line(pattern: re.Pattern) -> Dict[int, re.Match]:
+            matches = {}
+            for match in pattern.finditer(content):
+                matches.setdefault(bisect_right(line_starts, match.start()) - 1, match)
+            return matches
 
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        gym_leader_matches = first_match_per_line(_GYM_LEADER_RE)
+        inline_matches = first_match_per_line(_TRAINER_INLINE_RE)
+        if not gym_leader_matches and not inline_matches:
+            return trainers
 
-            # Format 1: Check for Gym Leader subsection header
-            gym_leader_match = re.search(r'###\s*Gym\s*Leader\s+(\w+)', line, re.IGNORECASE)
+        gym_prize_matches = first_match_per_line(_GYM_PRIZE_RE) if gym_leader_matches else {}
+        gym_pokemon_matches = first_match_per_line(_GYM_POKEMON_RE) if gym_leader_matches else {}
+
+        for i in sorted(gym_leader_matches.keys() | inline_matches.keys()):
+            # Format 1: Gym Leader subsection header
+            gym_leader_match = gym_leader_matches.get(i)
             if gym_leader_match:
                 trainer_name = gym_leader_match.group(1).strip()
                 trainer_class = "Gym Leader"
@@ -335,19 +604,19 @@ class KnowledgeParser:
 
                 # Scan next ~20 lines for Pokemon and prize
                 for j in range(i + 1, min(i + 20, len(lines))):
-                    next_line = lines[j]
+                    _, next_line, next_stripped, _ = lines[j]
 
                     # Stop at next section
                     if next_line.startswith('#'):
                         break
 
                     # Check for prize money
-                    prize_match = re.search(r'Prize:\s*(\d+)\s*Pokédollars', next_line)
+                    prize_match = gym_prize_matches.get(j)
                     if prize_match:
                         prize_money = int(prize_match.group(1))
 
                     # Check for Pokemon entries: "- **Species** (Type) ♀, Level 15"
-                    poke_match = re.search(r'^\s*-\s*\*\*([A-Za-z]+)\*\*\s*\(([^)]+)\)[^,]*,\s*Level\s*(\d+)', next_line)
+                    poke_match = gym_pokemon_matches.get(j)
                     if poke_match:
                         species = poke_match.group(1).strip()
                         poke_type = poke_match.group(2).strip()
@@ -357,7 +626,7 @@ class KnowledgeParser:
                             'species': species,
                             'type': poke_type,
                             'level': level,
-                            'raw': next_line.strip()
+                            'raw': next_stripped
                         })
 
                 if pokemon_list:
@@ -370,62 +639,55 @@ class KnowledgeParser:
                     trainers.append(trainer)
                     logger.debug(f"Found Gym Leader: {trainer_name} with {len(pokemon_list)} Pokemon")
 
-                i += 1
                 continue
 
             # Format 2: Inline trainer format
-            trainer_match = re.search(r'\*\*([^*]+)\*\*\s*-\s*(.+)', line)
-            if trainer_match:
-                trainer_name = trainer_match.group(1).strip()
-                pokemon_info = trainer_match.group(2).strip()
+            trainer_match = inline_matches[i]
+            trainer_name = trainer_match.group(1).strip()
+            pokemon_info = trainer_match.group(2).strip()
+
+            # Extract trainer class if in parentheses
+            class_match = _TRAINER_CLASS_RE.search(trainer_name)
+            trainer_class = class_match.group(1) if class_match else "Trainer"
+            trainer_name = _PAREN_CLASS_RE.sub('', trainer_name).strip()
+
+            # Parse Pokemon (simple parsing for now)
+            pokemon_list = []
+            for poke_entry in pokemon_info.split(';'):
+                poke_entry = poke_entry.strip()
+                if poke_entry:
+                    # Try to extract species and level
+                    level_match = _LEVEL_RE.search(poke_entry)
+                    level = int(level_match.group(1)) if level_match else None
+
+                    # Species is the first word(s) before level or comma
+                    species = _SPECIES_RE.match(poke_entry).group(1).translate(_STRIP_GENDER).strip()
+
+                    if species:
+                        pokemon_list.append({
+                            'species': species,
+                            'level': level,
+                            'raw': poke_entry
+                        })
 
-                # Extract trainer class if in parentheses
-                class_match = re.search(r'\(([^)]+)\)', trainer_name)
-                trainer_class = class_match.group(1) if class_match else "Trainer"
-                trainer_name = re.sub(r'\s*\([^)]+\)', '', trainer_name).strip()
+            # Extract prize money
+            prize_match = _PRIZE_RE.search(pokemon_info)
+            prize_money = int(prize_match.group(1)) if prize_match else None
 
-                # Parse Pokemon (simple parsing for now)
-                pokemon_list = []
-                for poke_entry in pokemon_info.split(';'):
-                    poke_entry = poke_entry.strip()
-                    if poke_entry:
-                        # Try to extract species and level
-                        level_match = re.search(r'Level?\s*(\d+)', poke_entry, re.IGNORECASE)
-                        level = int(level_match.group(1)) if level_match else None
-
-                        # Species is the first word(s) before level or comma
-                        species = re.split(r'[,\(]', poke_entry)[0].strip()
-                        species = re.sub(r'Level.*', '', species, flags=re.IGNORECASE).strip()
-                        species = re.sub(r'[♂♀]', '', species).strip()
-
-                        if species:
-                            pokemon_list.append({
-                                'species': species,
-                                'level': level,
-                                'raw': poke_entry
-                            })
-
-                # Extract prize money
-                prize_match = re.search(r'(\d+)\s*Pokédollars', pokemon_info)
-                prize_money = int(prize_match.group(1)) if prize_match else None
-
-                # Skip invalid trainers (no Pokemon extracted)
-                if not pokemon_list:
-                    logger.debug(f"Skipping invalid trainer entry: {trainer_name}")
-                    i += 1
-                    continue
-
-                trainer = TrainerInfo(
-                    name=trainer_name,
-                    trainer_class=trainer_class,
-                    pokemon=pokemon_list,
-                    prize_money=prize_money
-                )
-                trainers.append(trainer)
-
-                logger.debug(f"Found trainer: {trainer_name} ({trainer_class}) with {len(pokemon_list)} Pokemon")
-
-            i += 1
+            # Skip invalid trainers (no Pokemon extracted)
+            if not pokemon_list:
+                logger.debug(f"Skipping invalid trainer entry: {trainer_name}")
+                continue
+
+            trainer = TrainerInfo(
+                name=trainer_name,
+                trainer_class=trainer_class,
+                pokemon=pokemon_list,
+                prize_money=prize_money
+            )
+            trainers.append(trainer)
+
+            logger.debug(f"Found trainer: {trainer_name} ({trainer_class}) with {len(pokemon_list)} Pokemon")
 
         return trainers
 
@@ -440,38 +702,30 @@ class KnowledgeParser:
         pokemon = []
 
         # Look for "Available Pokemon" section
-        if '## Available Pokémon' in content or '## Available Pokemon' in content:
-            section_match = re.search(
-                r'##\s*Available\s*Pok[eé]mon\s*\n(.*?)(?=\n##|\Z)',
-                content,
-                re.DOTALL | re.IGNORECASE
-            )
+        section_match = _AVAILABLE_POKEMON_SECTION_RE.search(content)
 
-            if section_match:
-                pokemon_section = section_match.group(1)
+        if section_match:
+            pokemon_section = section_match.group(1)
 
-                # Parse each line with Pokemon info
-                for line in pokemon_section.split('\n'):
-                    line = line.strip()
+            # Parse each line with Pokemon info
+            for line in pokemon_section.split('\n'):
+                line = line.strip()
 
-                    # Pattern: "- **Species** - Level X-Y (Z%)"
-                    poke_match = re.search(
-                        r'[-*]\s*\*?\*?([A-Za-z\s]+?)\*?\*?\s*[-–]\s*Level\s*([\d-]+)\s*\(([^)]+)\)',
-                        line
-                    )
+                # Pattern: "- **Species** - Level X-Y (Z%)"
+                poke_match = _POKE_LINE_RE.search(line)
 
-                    if poke_match:
-                        species = poke_match.group(1).strip()
-                        level_range = poke_match.group(2).strip()
-                        encounter_rate = poke_match.group(3).strip()
+                if poke_match:
+                    species = poke_match.group(1).strip()
+                    level_range = poke_match.group(2).strip()
+                    encounter_rate = poke_match.group(3).strip()
 
-                        pokemon.append(PokemonEncounter(
-                            species=species,
-                            level_range=level_range,
-                            encounter_rate=encounter_rate
-                        ))
+                    pokemon.append(PokemonEncounter(
+                        species=species,
+                        level_range=level_range,
+                        encounter_rate=encounter_rate
+                    ))
 
-                        logger.debug(f"Found Pokemon: {species} (Lv {level_range}, {encounter_rate})")
+                    logger.debug(f"Found Pokemon: {species} (Lv {level_range}, {encounter_rate})")
 
         return pokemon
 
@@ -486,141 +740,132 @@ class KnowledgeParser:
         items = []
 
         # Look for "Items" section (both ## and ###)
-        if '## Items' in content or '### Items' in content:
-            # Try ## first
-            section_match = re.search(
-                r'##\s*Items\s*\n(.*?)(?=\n##|\Z)',
-                content,
-                re.DOTALL
-            )
-
-            # Try ### if ## didn't work
-            if not section_match:
-                section_match = re.search(
-                    r'###\s*Items\s*\n(.*?)(?=\n##|\Z)',
-                    content,
-                    re.DOTALL
-                )
+        section_match = _ITEMS_SECTION_RE.search(content)
 
-            if section_match:
-                items_section = section_match.group(1)
+        if section_match:
+            items_section = section_match.group(1)
 
-                # Parse each item line
-                for line in items_section.split('\n'):
-                    line = line.strip()
+            # Parse each item line
+            for line in items_section.split('\n'):
+                line = line.strip()
 
-                    # Pattern: "- **Item Name** - Location detail"
-                    item_match = re.search(r'[-*]\s*\*?\*?([^*\n-]+?)\*?\*?\s*[-–]\s*(.+)', line)
+                # Pattern: "- **Item Name** - Location detail"
+                item_match = _ITEM_LINE_RE.search(line)
 
-                    if item_match:
-                        item_name = item_match.group(1).strip()
-                        location_detail = item_match.group(2).strip()
+                if item_match:
+                    item_name = item_match.group(1).strip()
+                    location_detail = item_match.group(2).strip()
 
-                        # Check if hidden
-                        is_hidden = 'hidden' in location_detail.lower()
+                    # Check if hidden
+                    is_hidden = 'hidden' in location_detail.lower()
 
-                        # Check if requires HM
-                        requires_hm = None
-                        for hm in ['Cut', 'Surf', 'Strength', 'Rock Smash', 'Fly', 'Waterfall', 'Dive']:
-                            if hm in location_detail:
-                                requires_hm = hm
-                                break
+                    # Check if requires HM
+                    hm_match = _HM_RE.search(location_detail)
+                    requires_hm = hm_match.group(1) if hm_match else None
 
-                        items.append(ItemInfo(
-                            name=item_name,
-                            location_detail=location_detail,
-                            is_hidden=is_hidden,
-                            requires_hm=requires_hm
-                        ))
+                    items.append(ItemInfo(
+                        name=item_name,
+                        location_detail=location_detail,
+                        is_hidden=is_hidden,
+                        requires_hm=requires_hm
+                    ))
 
-                        logger.debug(f"Found item: {item_name} - {location_detail}")
+                    logger.debug(f"Found item: {item_name} - {location_detail}")
 
         return items
 
-    def _extract_tips(self, content: str) -> List[str]:
+    def _extract_tips(self, content: str, lines: Optional[List[_ClassifiedLine]] = None) -> List[str]:
         """
         Extract strategic tips and important notes.
 
         Looks for standalone paragraphs that give advice or warnings.
         """
         tips = []
+        seen = set()
 
-        # Common tip indicators
-        tip_indicators = [
-            'tip:', 'note:', 'important:', 'remember:', 'warning:',
-            'recommended', 'optimal', 'should', 'must', 'avoid',
-            'best choice', 'strategy', 'use', 'super effective',
-            'weak', 'strong against', 'advise', 'suggest'
-        ]
+        if lines is None:
+            lines = self._classify_lines(content)
 
-        lines = content.split('\n')
-        for line in lines:
-            line_lower = line.lower().strip()
-
-            # Skip headers and empty lines
-            if not line_lower or line.startswith('#'):
+        for kind, line, _, line_lower in lines:
+            # Skip headers and empty lines (only unindented '#' lines count here)
+            if kind == _LINE_BLANK or line.startswith('#'):
                 continue
 
             # Skip lines that are just list markers
-            if line_lower in ['-', '*', '•']:
+            if line_lower in {'-', '*', '•'}:
                 continue
 
             # Check if line contains tip indicators
-            if any(indicator in line_lower for indicator in tip_indicators):
+            if _TIP_INDICATOR_RE.search(line_lower):
                 # Clean up the line
                 tip = line.strip('- *•').strip()
-                if len(tip) >= 15:  # Substantial tip (lowered threshold)
+                # Substantial tip (lowered threshold), skipping duplicates
+                # while keeping document order
+                if len(tip) >= 15 and tip not in seen:
+                    seen.add(tip)
                     tips.append(tip)
 
-        return list(set(tips))  # Remove duplicates
+        return tips
 
-    def _extract_objectives(self, content: str, title: str) -> List[str]:
+    def _extract_objectives(
+        self,
+        content: str,
+        title: str,
+        subsections: Optional[Dict[str, str]] = None,
+        lines: Optional[List[_ClassifiedLine]] = None
+    ) -> List[str]:
         """
         Extract key objectives for this location.
 
         Looks for action-oriented statements and goals.
         """
-        objectives = []
-
-        # Look for subsection headers that indicate objectives
-        objective_headers = [
-            'Meet', 'Visit', 'Travel', 'Defeat', 'Obtain', 'Catch',
-            'Battle', 'Challenge', 'Receive', 'Get', 'Find', 'Enter',
-            'Go', 'Head', 'Navigate', 'Explore', 'Save', 'Help',
-            'Return', 'Arrive'
-        ]
+        if lines is None:
+            lines = self._classify_lines(content)
+        if subsections is None:
+            subsections = self._parse_subsections(content)
 
-        # Extract from subsection headers
-        subsections = self._parse_subsections(content)
+        # Keep the first MAX_OBJECTIVES unique candidates, in order, and stop
+        # generating candidates once that many are found
+        objectives = []
+        seen = set()
+        for objective in self._iter_objective_candidates(title, subsections, lines):
+            if objective not in seen:
+                seen.add(objective)
+                objectives.append(objective)
+                if len(objectives) >= MAX_OBJECTIVES:
+                    break
+
+        return objectives
+
+    @staticmethod
+    def _iter_objective_candidates(
+        title: str,
+        subsections: Dict[str, str],
+        lines: List[_ClassifiedLine]
+    ) -> Iterator[str]:
+        """Yield candidate objectives in priority order (may contain duplicates)"""
+        # Extract from subsection headers that indicate objectives
         for header in subsections.keys():
-            if any(verb in header for verb in objective_headers):
-                objectives.append(header)
+            if _OBJECTIVE_HEADER_RE.search(header):
+                yield header
 
         # Special case: Gym battles
         if 'Gym' in title:
-            objectives.append(f"Challenge and defeat the {title} Leader")
-            objectives.append(f"Earn badge from {title}")
+            yield f"Challenge and defeat the {title} Leader"
+            yield f"Earn badge from {title}"
 
         # Extract from descriptive paragraphs
-        lines = [l.strip() for l in content.split('\n') if l.strip()]
-        for i, line in enumerate(lines[:20]):  # Check first 20 lines
-            line_lower = line.lower()
-
+        non_blank = (row for row in lines if row[0] != _LINE_BLANK)
+        for kind, _, line, line_lower in itertools.islice(non_blank, 20):  # Check first 20 lines
             # Skip headers
-            if line.startswith('#'):
+            if kind == _LINE_HEADER:
                 continue
 
             # Look for sentences with action verbs
-            for verb in objective_headers:
-                if verb.lower() in line_lower and len(line) < 150:
-                    cleaned = line.strip('- *•.').strip()
-                    if len(cleaned) >= 20:
-                        objectives.append(cleaned)
-                        break
-
-        # Remove duplicates and limit
-        objectives = list(dict.fromkeys(objectives))  # Preserve order while removing dupes
-        return objectives[:8]  # Max 8 objectives
+            if len(line) < 150 and _OBJECTIVE_SENTENCE_RE.search(line_lower):
+                cleaned = line.strip('- *•.').strip()
+                if len(cleaned) >= 20:
+                    yield cleaned
 
     def _build_section_relationships(self):
         """Build prerequisite and next_section relationships"""
@@ -651,10 +896,7 @@ class KnowledgeParser:
         Returns:
             KnowledgeSection or None
         """
-        for section in self.sections.values():
-            if section.location_id == location:
-                return section
-        return None
+        return self._by_location.get(location)
 
     def get_section_by_milestone(self, milestone_id: str) -> Optional[KnowledgeSection]:
         """
@@ -666,10 +908,7 @@ class KnowledgeParser:
         Returns:
             KnowledgeSection or None
         """
-        for section in self.sections.values():
-            if milestone_id in section.milestone_ids:
-                return section
-        return None
+        return self._by_milestone.get(milestone_id)
 
     def get_relevant_sections(self,
                             current_milestone: str,
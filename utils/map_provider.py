@@ -8,16 +8,56 @@ Part of the Knowledge Base Implementation Plan - Phase 2
 """
 
 import logging
+import struct
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# PNG files start with this signature followed by the IHDR chunk, whose
+# big-endian width/height sit at bytes 16-24
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_HEADER_SIZE = 24
+
+# Milestone to location ID mapping, used to infer the map for a milestone
+MILESTONE_LOCATIONS: Mapping[str, Optional[str]] = MappingProxyType({
+    "GAME_RUNNING": None,  # No map for title screen
+    "INTRO_CUTSCENE_COMPLETE": "LITTLEROOT_TOWN",
+    "PLAYER_HOUSE_ENTERED": "LITTLEROOT_TOWN",
+    "PLAYER_BEDROOM": "LITTLEROOT_TOWN",
+    "CLOCK_SET": "LITTLEROOT_TOWN",
+    "RIVAL_HOUSE": "LITTLEROOT_TOWN",
+    "RIVAL_BEDROOM": "LITTLEROOT_TOWN",
+    "ROUTE_101": "ROUTE101",
+    "STARTER_CHOSEN": "ROUTE101",
+    "BIRCH_LAB_VISITED": "LITTLEROOT_TOWN",
+    "OLDALE_TOWN": "OLDALE_TOWN",
+    "ROUTE_103": "ROUTE103",
+    "RECEIVED_POKEDEX": "LITTLEROOT_TOWN",
+    "ROUTE_102": "ROUTE102",
+    "PETALBURG_CITY": "PETALBURG_CITY",
+    "DAD_FIRST_MEETING": "PETALBURG_CITY",
+    "GYM_EXPLANATION": "PETALBURG_CITY",
+    "ROUTE_104_SOUTH": "ROUTE104",
+    "PETALBURG_WOODS": "PETALBURG_WOODS",
+    "TEAM_AQUA_GRUNT_DEFEATED": "PETALBURG_WOODS",
+    "ROUTE_104_NORTH": "ROUTE104",
+    "RUSTBORO_CITY": "RUSTBORO_CITY",
+    "RUSTBORO_GYM_ENTERED": "RUSTBORO_CITY_GYM",
+    "ROXANNE_DEFEATED": "RUSTBORO_CITY_GYM",
+    "FIRST_GYM_COMPLETE": "RUSTBORO_CITY_GYM",
+})
+
+
+@dataclass(slots=True)
 class MapData:
     """Map image data with metadata"""
     location_name: str           # "Littleroot Town"
@@ -26,6 +66,7 @@ class MapData:
     map_bank: Optional[int] = None       # Game map bank (if known)
     map_number: Optional[int] = None     # Game map number (if known)
     description: str = ""                # Brief description
+    size: Optional[Tuple[int, int]] = None  # (width, height) from the PNG header, if readable
 
 
 class MapProvider:
@@ -34,9 +75,14 @@ class MapProvider:
 
     Maps are stored as .png files in data/knowledge/ directory and provide
     full-area overviews to complement the agent's limited viewport.
-    Images are lazy-loaded and cached for performance.
+    Images are lazy-loaded and cached for performance: the most recently
+    used ones are kept alive, older ones stay reusable only while something
+    else still references them.
     """
 
+    # Number of recently used images kept pinned in memory
+    IMAGE_CACHE_SIZE = 16
+
     def __init__(self, maps_directory: str = "data/knowledge"):
         """
         Initialize the map provider.
@@ -47,7 +93,13 @@ class MapProvider:
         self.maps_directory = Path(maps_directory)
         self.maps: Dict[str, MapData] = {}
         self.location_to_map: Dict[str, str] = {}  # Location ID -> map key
-        self._image_cache: Dict[str, Image.Image] = {}  # Cache loaded images
+        # Flattened location ID / milestone ID -> MapData, for single-lookup access
+        self._location_to_map_data: Dict[str, MapData] = {}
+        self._milestone_to_map_data: Dict[str, MapData] = {}
+        # Loaded images, held weakly; _recent_images pins the last IMAGE_CACHE_SIZE
+        self._image_cache: weakref.WeakValueDictionary[str, Image.Image] = weakref.WeakValueDictionary()
+        self._recent_images: OrderedDict[str, Image.Image] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
         # Location ID to filename mapping
         # Maps game location names to .png filenames
@@ -117,11 +169,12 @@ class MapProvider:
                 location_name = location_name.replace("_E", "")  # Remove _E suffix
                 location_name = location_name.replace("_", " ")  # Underscores to spaces
 
-                # Create map data (image loaded lazily)
+                # Create map data (image loaded lazily, size read from the header)
                 map_data = MapData(
                     location_name=location_name,
                     image_path=str(png_file),
-                    description=f"Overview map of {location_name}"
+                    description=f"Overview map of {location_name}",
+                    size=self._read_png_size(png_file)
                 )
 
                 # Index by filename (without extension)
@@ -133,15 +186,50 @@ class MapProvider:
             except Exception as e:
                 logger.error(f"Error indexing map {png_file}: {e}", exc_info=True)
 
-        # Build reverse mapping (location ID -> map key)
+        # Build reverse mapping (location ID -> map key); many locations share
+        # a file, so derive each file's key once
+        map_keys_by_filename: Dict[str, str] = {}
         for location_id, filename in self.location_mapping.items():
-            map_key = Path(filename).stem
+            map_key = map_keys_by_filename.get(filename)
+            if map_key is None:
+                map_key = map_keys_by_filename[filename] = Path(filename).stem
             if map_key in self.maps:
                 self.location_to_map[location_id] = map_key
                 logger.debug(f"Mapped location {location_id} -> {map_key}")
 
+        self._location_to_map_data = {
+            location_id: self.maps[map_key] for location_id, map_key in self.location_to_map.items()
+        }
+        self._milestone_to_map_data = {
+            milestone_id: self._location_to_map_data[location_id]
+            for milestone_id, location_id in MILESTONE_LOCATIONS.items()
+            if location_id in self._location_to_map_data
+        }
+
         logger.info(f"Successfully indexed {len(self.maps)} maps with {len(self.location_to_map)} location mappings")
 
+    @staticmethod
+    def _read_png_size(png_file: Path) -> Optional[Tuple[int, int]]:
+        """
+        Read image dimensions from the PNG IHDR chunk without opening it in PIL.
+
+        Args:
+            png_file: Path to the .png file
+
+        Returns:
+            (width, height), or None if the file isn't a readable PNG
+        """
+        try:
+            with open(png_file, 'rb') as f:
+                header = f.read(PNG_HEADER_SIZE)
+        except OSError as e:
+            logger.debug("Could not read PNG header of %s: %s", png_file, e)
+            return None
+
+        if len(header) < PNG_HEADER_SIZE or not header.startswith(PNG_SIGNATURE) or header[12:16] != b"IHDR":
+            return None
+        return struct.unpack(">II", header[16:24])
+
     def _load_image(self, map_key: str) -> Optional[Image.Image]:
         """
         Load image from disk with caching.
@@ -152,17 +240,19 @@ class MapProvider:
         Returns:
             PIL Image or None if loading fails
         """
-        # Check cache first
-        if map_key in self._image_cache:
-            logger.debug(f"Using cached image for {map_key}")
-            return self._image_cache[map_key]
-
         # Get map data
         map_data = self.maps.get(map_key)
         if not map_data:
             logger.warning(f"No map data found for key: {map_key}")
             return None
 
+        # Check cache first
+        image = self._image_cache.get(map_key)
+        if image is not None:
+            logger.debug("Using cached image for %s", map_key)
+            self._remember_image(map_key, map_data, image)
+            return image
+
         # Load image
         try:
             image_path = Path(map_data.image_path)
@@ -173,11 +263,9 @@ class MapProvider:
             image = Image.open(image_path)
             logger.info(f"Loaded map image: {map_key} ({image.size[0]}x{image.size[1]})")
 
-            # Cache the image
+            # Cache the image (also updates map_data.image)
             self._image_cache[map_key] = image
-
-            # Also update the map_data
-            map_data.image = image
+            self._remember_image(map_key, map_data, image)
 
             return image
 
@@ -185,6 +273,28 @@ class MapProvider:
             logger.error(f"Error loading map image {map_data.image_path}: {e}", exc_info=True)
             return None
 
+    def _remember_image(self, map_key: str, map_data: MapData, image: Image.Image):
+        """
+        Mark an image as most recently used, unpinning the least recent one.
+
+        Evicted maps drop their MapData.image reference so the weak cache can
+        release the pixels once no caller holds the image any more.
+
+        Args:
+            map_key: Map key of the image
+            map_data: MapData the image belongs to
+            image: Loaded PIL image
+        """
+        with self._cache_lock:
+            map_data.image = image
+            self._recent_images[map_key] = image
+            self._recent_images.move_to_end(map_key)
+            while len(self._recent_images) > self.IMAGE_CACHE_SIZE:
+                evicted_key, _ = self._recent_images.popitem(last=False)
+                evicted = self.maps.get(evicted_key)
+                if evicted is not None:
+                    evicted.image = None
+
     def get_map_for_location(self, location: str) -> Optional[MapData]:
         """
         Get map data for a game location.
@@ -195,28 +305,16 @@ class MapProvider:
         Returns:
             MapData with loaded image, or None if not found
         """
-        # Normalize location
-        location = location.upper().strip()
-
-        # Look up map key
-        map_key = self.location_to_map.get(location)
-        if not map_key:
-            logger.debug(f"No map mapping found for location: {location}")
-            return None
-
-        # Get map data
-        map_data = self.maps.get(map_key)
-        if not map_data:
-            logger.warning(f"Map data not found for key: {map_key}")
-            return None
-
-        # Ensure image is loaded
-        if map_data.image is None:
-            image = self._load_image(map_key)
-            if image is None:
+        # Keys are already normalized, so only normalize on a miss
+        map_data = self._location_to_map_data.get(location)
+        if map_data is None:
+            location = location.upper().strip()
+            map_data = self._location_to_map_data.get(location)
+            if map_data is None:
+                logger.debug("No map mapping found for location: %s", location)
                 return None
 
-        return map_data
+        return self._ensure_image(map_data)
 
     def get_map_for_milestone(self, milestone_id: str) -> Optional[MapData]:
         """
@@ -228,41 +326,26 @@ class MapProvider:
         Returns:
             MapData or None
         """
-        # Milestone to location mapping
-        milestone_locations = {
-            "GAME_RUNNING": None,  # No map for title screen
-            "INTRO_CUTSCENE_COMPLETE": "LITTLEROOT_TOWN",
-            "PLAYER_HOUSE_ENTERED": "LITTLEROOT_TOWN",
-            "PLAYER_BEDROOM": "LITTLEROOT_TOWN",
-            "CLOCK_SET": "LITTLEROOT_TOWN",
-            "RIVAL_HOUSE": "LITTLEROOT_TOWN",
-            "RIVAL_BEDROOM": "LITTLEROOT_TOWN",
-            "ROUTE_101": "ROUTE101",
-            "STARTER_CHOSEN": "ROUTE101",
-            "BIRCH_LAB_VISITED": "LITTLEROOT_TOWN",
-            "OLDALE_TOWN": "OLDALE_TOWN",
-            "ROUTE_103": "ROUTE103",
-            "RECEIVED_POKEDEX": "LITTLEROOT_TOWN",
-            "ROUTE_102": "ROUTE102",
-            "PETALBURG_CITY": "PETALBURG_CITY",
-            "DAD_FIRST_MEETING": "PETALBURG_CITY",
-            "GYM_EXPLANATION": "PETALBURG_CITY",
-            "ROUTE_104_SOUTH": "ROUTE104",
-            "PETALBURG_WOODS": "PETALBURG_WOODS",
-            "TEAM_AQUA_GRUNT_DEFEATED": "PETALBURG_WOODS",
-            "ROUTE_104_NORTH": "ROUTE104",
-            "RUSTBORO_CITY": "RUSTBORO_CITY",
-            "RUSTBORO_GYM_ENTERED": "RUSTBORO_CITY_GYM",
-            "ROXANNE_DEFEATED": "RUSTBORO_CITY_GYM",
-            "FIRST_GYM_COMPLETE": "RUSTBORO_CITY_GYM",
-        }
-
-        location = milestone_locations.get(milestone_id)
-        if not location:
-            logger.debug(f"No location mapping for milestone: {milestone_id}")
+        map_data = self._milestone_to_map_data.get(milestone_id)
+        if map_data is None:
+            logger.debug("No map for milestone: %s", milestone_id)
             return None
 
-        return self.get_map_for_location(location)
+        return self._ensure_image(map_data)
+
+    def _ensure_image(self, map_data: MapData) -> Optional[MapData]:
+        """
+        Make sure a map's image is loaded.
+
+        Args:
+            map_data: MapData to load the image for
+
+        Returns:
+            The same MapData, or None if its image can't be loaded
+        """
+        if map_data.image is None and self._load_image(Path(map_data.image_path).stem) is None:
+            return None
+        return map_data
 
     def get_map_by_coords(self, map_bank: int, map_number: int) -> Optional[MapData]:
         """
@@ -286,16 +369,47 @@ class MapProvider:
         """Get all available maps (without loading images)"""
         return self.maps.copy()
 
-    def preload_all_maps(self):
-        """Preload all map images into cache (useful for performance)"""
+    def preload_all_maps(self, max_workers: int = 1):
+        """
+        Preload all map images into cache (useful for performance).
+
+        Images are decoded here rather than on first use, so the first
+        resize on an agent step doesn't pay for reading and inflating the PNG.
+
+        Args:
+            max_workers: Number of threads used to load images; PIL releases
+                the GIL during file I/O and decoding, so loads overlap
+        """
         logger.info(f"Preloading {len(self.maps)} map images...")
-        for map_key in self.maps.keys():
-            self._load_image(map_key)
+        map_keys = list(self.maps.keys())
+        if max_workers > 1 and len(map_keys) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(map_keys))) as executor:
+                list(executor.map(self._preload_image, map_keys))
+        else:
+            for map_key in map_keys:
+                self._preload_image(map_key)
         logger.info(f"Preloaded {len(self._image_cache)} map images")
 
+    def _preload_image(self, map_key: str):
+        """
+        Load a map image and decode its pixels.
+
+        Args:
+            map_key: Map key to load
+        """
+        image = self._load_image(map_key)
+        if image is None:
+            return
+        try:
+            image.load()
+        except Exception as e:
+            logger.error(f"Error decoding map image {map_key}: {e}", exc_info=True)
+
     def clear_cache(self):
         """Clear the image cache to free memory"""
-        self._image_cache.clear()
+        with self._cache_lock:
+            self._recent_images.clear()
+            self._image_cache.clear()
         for map_data in self.maps.values():
             map_data.image = None
         logger.info("Cleared map image cache")
@@ -325,7 +439,8 @@ class MapProvider:
             logger.warning("Cannot resize map: image not loaded")
             return None
 
-        width, height = map_data.image.size
+        # Header size avoids touching the image; pixels are only decoded by resize()
+        width, height = map_data.size or map_data.image.size
 
         # Check if resize needed
         if width <= max_size and height <= max_size:
@@ -8,10 +8,54 @@ Different models have different strengths, context limits, and formatting prefer
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Family fallbacks for model names with no matching config, in priority
+# order: (name substrings, config key, description for the log)
+MODEL_FAMILY_FALLBACKS = (
+    (("gemini",), "gemini-2.5-flash", "Gemini family"),
+    (("gpt-4",), "gpt-4o", "GPT-4 family"),
+    (("o3", "o1"), "o3-mini", "OpenAI reasoning model"),
+    (("qwen",), "qwen2-vl", "Qwen model"),
+    (("phi",), "phi-3.5-vision", "Phi model"),
+)
+
+# Model-specific prompt preambles, prepended by ModelOptimizer.optimize_prompt
+
+# GPT-4 models: strategic planning emphasis (overworld only)
+GPT4_STRATEGIC_EMPHASIS = """
+🧠 STRATEGIC THINKING (GPT-4 Optimization):
+Before choosing your action, consider:
+1. What is the optimal path to the next milestone?
+2. What are potential obstacles or inefficiencies?
+3. How can I minimize total actions while staying on the critical path?
+
+Think step-by-step about long-term efficiency, not just immediate progress.
+"""
+
+# o3-mini: structured reasoning prompt (every context)
+O3_REASONING_STRUCTURE = """
+📋 REASONING STRUCTURE:
+1. **Assess**: What is the current situation and objective?
+2. **Plan**: What are the 2-3 best options and their expected outcomes?
+3. **Decide**: Which option maximizes progress with minimum actions?
+4. **Execute**: Output your chosen action with brief reasoning.
+
+Be concise and systematic in your decision-making process.
+"""
+
+# Gemini models: vision emphasis (battles only)
+GEMINI_VISION_EMPHASIS = """
+👁️ VISUAL ANALYSIS (Gemini Optimization):
+- Examine the battle screen carefully for HP bars, move names, and Pokemon sprites
+- Use visual cues to confirm battle state (your turn, opponent's turn, victory/defeat)
+- Cross-reference visual information with game state data for accuracy
+
+Gemini excels at vision - use the visual frame as primary source of truth.
+"""
+
 
 class ModelOptimizer:
     """
@@ -144,6 +188,7 @@ class ModelOptimizer:
         """
         self.model_name = model_name.lower()
         self.config = self._get_model_config()
+        self._preamble_by_context, self._default_preamble = self._build_prompt_preambles()
 
         logger.info(
             f"Model Optimizer initialized for {model_name} "
@@ -163,26 +208,36 @@ class ModelOptimizer:
                 return config
 
         # Try family detection
-        if "gemini" in self.model_name:
-            logger.info(f"Detected Gemini family for '{self.model_name}', using gemini-2.5-flash config")
-            return self.MODEL_CONFIGS["gemini-2.5-flash"]
-        elif "gpt-4" in self.model_name:
-            logger.info(f"Detected GPT-4 family for '{self.model_name}', using gpt-4o config")
-            return self.MODEL_CONFIGS["gpt-4o"]
-        elif "o3" in self.model_name or "o1" in self.model_name:
-            logger.info(f"Detected OpenAI reasoning model for '{self.model_name}', using o3-mini config")
-            return self.MODEL_CONFIGS["o3-mini"]
-        elif "qwen" in self.model_name:
-            logger.info(f"Detected Qwen model for '{self.model_name}', using qwen2-vl config")
-            return self.MODEL_CONFIGS["qwen2-vl"]
-        elif "phi" in self.model_name:
-            logger.info(f"Detected Phi model for '{self.model_name}', using phi-3.5-vision config")
-            return self.MODEL_CONFIGS["phi-3.5-vision"]
+        for markers, config_key, family_desc in MODEL_FAMILY_FALLBACKS:
+            if any(marker in self.model_name for marker in markers):
+                logger.info(f"Detected {family_desc} for '{self.model_name}', using {config_key} config")
+                return self.MODEL_CONFIGS[config_key]
 
         # Default
         logger.warning(f"Unknown model '{self.model_name}', using default config")
         return self.MODEL_CONFIGS["default"]
 
+    def _build_prompt_preambles(self) -> Tuple[Dict[str, str], str]:
+        """
+        Work out once which preamble optimize_prompt adds for each context.
+
+        Returns:
+            (preamble by context, preamble for any other context), each
+            already joined to the prompt separator
+        """
+        # For compact mode, prompt is already optimized via get_compact_prompt
+        if self.config["compact_mode"]:
+            return {}, ""
+
+        family = self.config["family"]
+        if family == "gpt4":
+            return {"overworld": GPT4_STRATEGIC_EMPHASIS + "\n"}, ""
+        if family == "o3":
+            return {}, O3_REASONING_STRUCTURE + "\n"
+        if family == "gemini":
+            return {"battle": GEMINI_VISION_EMPHASIS + "\n"}, ""
+        return {}, ""
+
     def should_use_compact_prompt(self) -> bool:
         """Check if compact prompt mode should be used"""
         return self.config["compact_mode"]
@@ -230,54 +285,8 @@ class ModelOptimizer:
         Returns:
             Optimized prompt for the model
         """
-        # For compact mode, prompt is already optimized via get_compact_prompt
-        if self.should_use_compact_prompt():
-            return base_prompt
-
-        # Add model-specific enhancements
-        optimized = base_prompt
-
-        # GPT-4 models: Add strategic planning emphasis
-        if self.config["family"] == "gpt4":
-            if context == "overworld":
-                strategic_emphasis = """
-🧠 STRATEGIC THINKING (GPT-4 Optimization):
-Before choosing your action, consider:
-1. What is the optimal path to the next milestone?
-2. What are potential obstacles or inefficiencies?
-3. How can I minimize total actions while staying on the critical path?
-
-Think step-by-step about long-term efficiency, not just immediate progress.
-"""
-                optimized = strategic_emphasis + "\n" + optimized
-
-        # o3-mini: Add structured reasoning prompt
-        elif self.config["family"] == "o3":
-            reasoning_structure = """
-📋 REASONING STRUCTURE:
-1. **Assess**: What is the current situation and objective?
-2. **Plan**: What are the 2-3 best options and their expected outcomes?
-3. **Decide**: Which option maximizes progress with minimum actions?
-4. **Execute**: Output your chosen action with brief reasoning.
-
-Be concise and systematic in your decision-making process.
-"""
-            optimized = reasoning_structure + "\n" + optimized
-
-        # Gemini models: Emphasize vision and context
-        elif self.config["family"] == "gemini":
-            if context == "battle":
-                vision_emphasis = """
-👁️ VISUAL ANALYSIS (Gemini Optimization):
-- Examine the battle screen carefully for HP bars, move names, and Pokemon sprites
-- Use visual cues to confirm battle state (your turn, opponent's turn, victory/defeat)
-- Cross-reference visual information with game state data for accuracy
-
-Gemini excels at vision - use the visual frame as primary source of truth.
-"""
-                optimized = vision_emphasis + "\n" + optimized
-
-        return optimized
+        preamble = self._preamble_by_context.get(context, self._default_preamble)
+        return preamble + base_prompt if preamble else base_prompt
 
     def get_recommended_settings(self) -> Dict[str, Any]:
         """